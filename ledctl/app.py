@@ -37,7 +37,7 @@ import_handler = logging.StreamHandler()
 import_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
 import_logger.addHandler(import_handler)
 
-from core.config import Config, ConfigurationError
+from core.config import Config, ConfigurationError, SafeLoader
 from core.drivers import DeviceManager
 from core.drivers.mock import MockDevice
 from core.errors import (
@@ -45,7 +45,7 @@ from core.errors import (
     FileProcessingError, safe_execute, emit_error
 )
 from core.security import (
-    setup_security, limiter, validate_input, require_api_key,
+    setup_security, init_rate_limiter, limiter, validate_input, require_api_key,
     sanitize_path, validate_file_type, FileUploadSchema,
     DeviceConfigSchema, AnimationControlSchema, ParameterUpdateSchema
 )
@@ -116,6 +116,10 @@ register_error_handlers(app, socketio)
 # Setup security features
 setup_security(app, socketio)
 
+# Socket.IO payload schemas, built once and shared across events
+parameter_schema = ParameterUpdateSchema()
+device_config_schema = DeviceConfigSchema()
+
 # Track app start time for uptime
 app.start_time = time.time()
 
@@ -144,7 +148,7 @@ def load_config(config_path='config/device.default.yml'):
     """Load configuration from YAML file"""
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
         logger.info(f"Configuration loaded from {config_path}")
         return config
     except Exception as e:
@@ -179,7 +183,7 @@ def initialize_device(device_type, config):
         # Create frame processor
         try:
             width, height = device.get_dimensions()
-            state.frame_processor = FrameProcessor(width, height, config)
+            state.frame_processor = FrameProcessor(width, height, config, device=device)
         except Exception as e:
             device.close()
             raise DeviceError(f"Failed to create frame processor: {str(e)}", device_type=device_type)
@@ -188,6 +192,14 @@ def initialize_device(device_type, config):
         state.gamma_corrector = create_corrector(config)
         state.gamma_corrector.set_brightness(state.params['brightness'])
         
+        # Re-pack the playing animation for the new device (or drop stale buffers)
+        if hasattr(state.current_animation, 'pack_for'):
+            try:
+                state.current_animation.pack_for(device)
+            except Exception as e:
+                logger.warning(f"Failed to pack current animation for {device_type}: {e}")
+                state.current_animation.pack_for(None)
+        
         state.device = device
         logger.info(f"Initialized {device_type} device: {width}x{height}")
         
@@ -237,16 +249,26 @@ def playback_worker():
                     # MediaAnimation
                     frame = state.current_animation.get_next_frame(delta_time)
                 
-                # Apply gamma correction and RGB balance
-                if state.gamma_corrector:
-                    frame = state.gamma_corrector.correct_frame(frame)
-                
-                # Convert to RGB list
-                rgb_data = state.current_animation.to_rgb_list(frame)
-                
-                # Send to device
-                h, w = frame.shape[:2]
-                state.device.draw_rgb_frame(w, h, rgb_data)
+                # Frames prepacked for the device skip conversion entirely;
+                # the device applies color correction as a per-channel table
+                packed = None
+                if hasattr(state.current_animation, 'get_packed_frame'):
+                    packed = state.current_animation.get_packed_frame(state.device)
+                if packed is not None:
+                    corrector = state.gamma_corrector
+                    color_lut = None if not corrector or corrector.is_identity else corrector.lut
+                    state.device.draw_packed(packed, color_lut)
+                else:
+                    # Apply gamma correction and RGB balance
+                    if state.gamma_corrector:
+                        frame = state.gamma_corrector.correct_frame(frame)
+                    
+                    # Flatten to (N, 3) uint8 - devices take the array directly
+                    rgb_data = state.current_animation.to_rgb_ndarray(frame)
+                    
+                    # Send to device
+                    h, w = frame.shape[:2]
+                    state.device.draw_rgb_frame(w, h, rgb_data)
                 
                 # Emit frame info less frequently to reduce overhead
                 frame_count += 1
@@ -518,8 +540,7 @@ def handle_set_parameter(data):
     """Update playback parameter"""
     # Validate input
     try:
-        schema = ParameterUpdateSchema()
-        validated = schema.load(data)
+        validated = parameter_schema.load(data)
         param = validated['parameter']
         value = validated['value']
     except ValidationError as e:
@@ -606,8 +627,7 @@ def handle_switch_device(data):
     """Switch to different LED hardware"""
     # Validate input
     try:
-        schema = DeviceConfigSchema()
-        validated = schema.load(data)
+        validated = device_config_schema.load(data)
         device_type = validated['device_type']
     except ValidationError as e:
         emit('error', {'message': 'Invalid device configuration', 'details': e.messages})
@@ -673,6 +693,9 @@ def main():
             logger.error(f"Configuration error: {e}")
             return
     
+    # Attach rate limiting now that REDIS_URL from any --env file is visible
+    init_rate_limiter(app)
+    
     # Register device types
     register_devices()
     
@@ -8,6 +8,12 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
+try:
+    # libyaml-backed loader when available; app and diagnostics import it from here
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,14 +78,14 @@ class Config:
             # First try the specified path
             if os.path.exists(self.config_path):
                 with open(self.config_path, 'r') as f:
-                    return yaml.safe_load(f) or {}
+                    return yaml.load(f, Loader=SafeLoader) or {}
             
             # Fall back to default config
             default_path = self.config_path.replace('.yml', '.default.yml')
             if os.path.exists(default_path):
                 logger.info(f"Using default config from {default_path}")
                 with open(default_path, 'r') as f:
-                    return yaml.safe_load(f) or {}
+                    return yaml.load(f, Loader=SafeLoader) or {}
                     
             logger.warning(f"No config file found at {self.config_path}")
             return {}
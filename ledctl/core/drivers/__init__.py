@@ -59,7 +59,8 @@ class OutputDevice(ABC):
         Args:
             width: Frame width
             height: Frame height
-            rgb_data: Flattened list of RGB tuples (R, G, B values 0-255)
+            rgb_data: Flattened list of RGB tuples or (N, 3) uint8 array
+                      (R, G, B values 0-255)
         """
         pass
     
@@ -6,8 +6,10 @@ and rpi-rgb-led-matrix library.
 """
 
 import logging
+import numpy as np
 from typing import List, Tuple, Dict, Any
 from . import OutputDevice, DeviceManager
+from ..gamma import build_lut
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +47,7 @@ class HUB75Device(OutputDevice):
         self.disable_hardware_pulsing = hub75_config.get('disable_hardware_pulsing', True)
         self.scan_mode = hub75_config.get('scan_mode', 0)  # 0=progressive, 1=interlaced
         self.dithering = hub75_config.get('dithering', 0)  # 0=off, 1=on
+        self.gamma = hub75_config.get('gamma', 1.0)  # Panel gamma (render.gamma is applied upstream)
         
         # Set dimensions
         self.width = self.cols * self.chain_length
@@ -53,6 +56,8 @@ class HUB75Device(OutputDevice):
         # Performance optimizations
         self._last_frame_data = None
         self._frame_buffer = None
+        self._draw_fn = None
+        self._gamma_lut = build_lut(self.gamma)
         
     def open(self) -> None:
         """Initialize HUB75 matrix hardware"""
@@ -93,6 +98,14 @@ class HUB75Device(OutputDevice):
             self.matrix = RGBMatrix(options=self.options)
             self.offscreen_canvas = self.matrix.CreateFrameCanvas()
             
+            # Resolve the pixel upload method once instead of per frame.
+            # SwapOnVSync hands back canvases of the same type, so the
+            # choice stays valid for the lifetime of the matrix.
+            if hasattr(self.offscreen_canvas, 'SetPixels'):
+                self._draw_fn = self._draw_set_pixels
+            else:
+                self._draw_fn = self._draw_set_pixel
+            
             # Pre-allocate frame buffer for performance
             self._frame_buffer = [(0, 0, 0)] * (self.width * self.height)
             
@@ -138,7 +151,7 @@ class HUB75Device(OutputDevice):
         Args:
             width: Frame width
             height: Frame height
-            rgb_data: Flattened list of RGB tuples
+            rgb_data: Flattened list of RGB tuples or (N, 3) uint8 array
         """
         if not self.is_open or not self.matrix:
             raise RuntimeError("Device not open")
@@ -155,44 +168,45 @@ class HUB75Device(OutputDevice):
         else:
             scaled_data = rgb_data
             
+        # Clamp to uint8 and apply the panel gamma table in one gather
+        arr = np.asarray(scaled_data).reshape(-1, 3)
+        if arr.dtype != np.uint8:
+            arr = np.clip(arr, 0, 255).astype(np.uint8)
+        if self.gamma != 1.0:
+            arr = np.take(self._gamma_lut, arr, mode='clip')
+            
         # Draw to matrix with optimizations
         try:
             # Skip identical frames
-            if self._last_frame_data is not None and scaled_data == self._last_frame_data:
+            if self._last_frame_data is not None and np.array_equal(arr, self._last_frame_data):
                 return
             
-            # Use faster bulk pixel setting if available
-            if hasattr(self.offscreen_canvas, 'SetPixels'):
-                # Bulk set pixels (if supported by newer versions)
-                pixels = []
-                for idx in range(len(scaled_data)):
-                    r, g, b = scaled_data[idx]
-                    # Clamp values inline for speed
-                    pixels.append((min(255, max(0, int(r))),
-                                 min(255, max(0, int(g))),
-                                 min(255, max(0, int(b)))))
-                self.offscreen_canvas.SetPixels(0, 0, self.width, self.height, pixels)
-            else:
-                # Fall back to individual pixel setting
-                for y in range(self.height):
-                    row_offset = y * self.width
-                    for x in range(self.width):
-                        idx = row_offset + x
-                        if idx < len(scaled_data):
-                            r, g, b = scaled_data[idx]
-                            # Inline clamping for performance
-                            self.offscreen_canvas.SetPixel(x, y, 
-                                                         min(255, max(0, int(r))),
-                                                         min(255, max(0, int(g))),
-                                                         min(255, max(0, int(b))))
+            self._draw_fn(arr)
                         
             self.offscreen_canvas = self.matrix.SwapOnVSync(self.offscreen_canvas)
-            self._last_frame_data = scaled_data
+            
+            # Keep our own copy; callers may reuse their frame buffer
+            if self._last_frame_data is None or self._last_frame_data.shape != arr.shape:
+                self._last_frame_data = arr.copy()
+            else:
+                np.copyto(self._last_frame_data, arr)
             
         except Exception as e:
             logger.error(f"Error drawing to HUB75 matrix: {e}")
             raise
             
+    def _draw_set_pixels(self, pixels: np.ndarray) -> None:
+        """Bulk set pixels (if supported by newer library versions)"""
+        self.offscreen_canvas.SetPixels(0, 0, self.width, self.height,
+                                        list(map(tuple, pixels.tolist())))
+        
+    def _draw_set_pixel(self, pixels: np.ndarray) -> None:
+        """Fall back to individual pixel setting"""
+        set_pixel = self.offscreen_canvas.SetPixel
+        width = self.width
+        for idx, (r, g, b) in enumerate(pixels.tolist()[:width * self.height]):
+            set_pixel(idx % width, idx // width, r, g, b)
+                                                 
     def _scale_frame(self, rgb_data: List[Tuple[int, int, int]], 
                      src_w: int, src_h: int, 
                      dst_w: int, dst_h: int) -> List[Tuple[int, int, int]]:
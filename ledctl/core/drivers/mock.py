@@ -7,7 +7,7 @@ Useful for development and testing on non-Raspberry Pi systems.
 
 import logging
 import numpy as np
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 from . import OutputDevice
 
@@ -51,31 +51,38 @@ class MockDevice(OutputDevice):
         self.brightness = max(0.0, min(1.0, brightness))
         logger.debug(f"MockDevice brightness set to {self.brightness}")
     
-    def draw_rgb_frame(self, width: int, height: int, data: List[Tuple[int, int, int]]):
-        """Simulate drawing a frame"""
+    def draw_rgb_frame(self, width: int, height: int,
+                       data: Union[List[Tuple[int, int, int]], np.ndarray]):
+        """Simulate drawing a frame from RGB tuples or a uint8 (H, W, 3) array"""
         if not self.is_open:
             raise RuntimeError("MockDevice is not open")
         
         # Validate data
         expected_pixels = width * height
-        if len(data) != expected_pixels:
-            raise ValueError(f"Expected {expected_pixels} pixels, got {len(data)}")
+        is_array = isinstance(data, np.ndarray)
+        pixel_count = data.size // 3 if is_array else len(data)
+        if pixel_count != expected_pixels:
+            raise ValueError(f"Expected {expected_pixels} pixels, got {pixel_count}")
         
-        # Store frame for debugging
-        self.last_frame = data
+        # Store frame for debugging. Arrays are copied: corrected frames come
+        # from GammaCorrector's reused buffer, which the next frame overwrites
+        self.last_frame = np.array(data, copy=True) if is_array else data
         self.frame_count += 1
         
         # Log every 30th frame to avoid spam
         if self.frame_count % 30 == 0:
             # Calculate average brightness of frame
-            total_brightness = sum(sum(pixel) for pixel in data)
-            avg_brightness = total_brightness / (len(data) * 3 * 255)
+            if is_array:
+                avg_brightness = float(data.mean()) / 255
+            else:
+                total_brightness = sum(sum(pixel) for pixel in data)
+                avg_brightness = total_brightness / (len(data) * 3 * 255)
             logger.debug(f"MockDevice frame {self.frame_count}: {width}x{height}, "
                         f"avg brightness: {avg_brightness:.2%}")
     
     def clear(self):
         """Clear the mock display"""
         if self.is_open:
-            black_frame = [(0, 0, 0)] * (self.width * self.height)
+            black_frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
             self.draw_rgb_frame(self.width, self.height, black_frame)
             logger.debug("MockDevice cleared")
\ No newline at end of file
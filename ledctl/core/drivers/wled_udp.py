@@ -8,12 +8,66 @@ Compatible with WARLS, DRGB, and DNRGB protocols.
 import socket
 import struct
 import logging
+from functools import lru_cache
+from itertools import chain
 from typing import List, Tuple, Dict, Any
 import time
 from . import OutputDevice, DeviceManager
 
 logger = logging.getLogger(__name__)
 
+# WARLS header: protocol, timeout, LED count, channel, sequence, physical start
+_WARLS_HEADER = struct.Struct('!BHHBBH')
+
+# DNRGB header: protocol, start index
+_DNRGB_HEADER = struct.Struct('!BH')
+
+try:
+    import numpy as np
+    from ..gamma import build_lut
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    logger.warning("numpy not available - WLED gamma correction disabled, using SWAR brightness")
+
+
+@lru_cache(maxsize=8)
+def _swar_masks(length: int) -> Tuple[int, int]:
+    """Lane masks for a payload of the given length (cached per frame size)"""
+    lanes = (length + 1) // 2
+    return (int.from_bytes(b'\xff\x00' * lanes, 'little'),
+            int.from_bytes(b'\x01\x00' * lanes, 'little'))
+
+
+def _swar_scale(payload: bytes, brightness: int) -> bytes:
+    """
+    Scale every byte of payload by brightness / 255 (floor) without a per-byte loop
+    
+    The payload is treated as one integer and split into even/odd bytes, each
+    sitting in its own 16-bit lane so a byte * brightness product can't carry
+    into its neighbour. The divide by 255 uses the exact identity
+    t // 255 == (t + 1 + (t >> 8)) >> 8 for 0 <= t <= 255 * 255, so the whole
+    frame is scaled with a handful of C-level big-int operations.
+    
+    Args:
+        payload: Raw RGB bytes
+        brightness: Brightness 0-255
+        
+    Returns:
+        Scaled RGB bytes of the same length
+    """
+    length = len(payload)
+    mask, ones = _swar_masks(length)
+    value = int.from_bytes(payload, 'little')
+    
+    lanes = []
+    for lane in (value & mask, (value >> 8) & mask):
+        lane *= brightness
+        lane = ((lane + ones + ((lane >> 8) & mask)) >> 8) & mask
+        lanes.append(lane)
+        
+    return (lanes[0] | (lanes[1] << 8)).to_bytes(length, 'little')
+
 
 class WLEDDevice(OutputDevice):
     """WLED network LED controller implementation"""
@@ -24,9 +78,14 @@ class WLEDDevice(OutputDevice):
     DNRGB_PROTOCOL = 3
     
     # WARLS packet structure
-    WARLS_HEADER_SIZE = 10
+    WARLS_HEADER_SIZE = _WARLS_HEADER.size
     WARLS_MAX_LEDS = 490  # Max LEDs per packet
     
+    # DNRGB packet structure
+    DNRGB_MAX_LEDS = 489  # Max LEDs per packet (3-byte header)
+    DNRGB_MERGE_GAP = 8  # Unchanged LEDs resent rather than starting a new packet
+    DNRGB_REFRESH_INTERVAL = 1.0  # Seconds between forced full frames
+    
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.socket = None
@@ -37,6 +96,7 @@ class WLEDDevice(OutputDevice):
         self.port = wled_config.get('port', 21324)
         self.timeout = wled_config.get('timeout', 2.0)
         self.protocol = wled_config.get('protocol', 'WARLS').upper()
+        self.gamma = wled_config.get('gamma', 1.0)  # Strip gamma (render.gamma is applied upstream)
         
         # Get dimensions from config or try to detect
         self.width = wled_config.get('width', 16)
@@ -50,6 +110,18 @@ class WLEDDevice(OutputDevice):
         # Brightness (0-255 for WLED)
         self.brightness = 255
         
+        # Fused gamma + brightness table, rebuilt whenever either changes
+        self._lut = build_lut(self.gamma, self.brightness) if HAS_NUMPY else None
+        
+        # Packet buffer reused for every send (largest packet is a full WARLS one)
+        self._sendbuf = bytearray(3 * self.WARLS_MAX_LEDS + 16)
+        self._sendview = memoryview(self._sendbuf)
+        self._sendarr = np.frombuffer(self._sendbuf, dtype=np.uint8) if HAS_NUMPY else None
+        
+        # Last frame sent over DNRGB, used to send only changed spans
+        self._last_arr = None
+        self._last_full_time = 0
+        
     def open(self) -> None:
         """Initialize UDP socket for WLED communication"""
         if self.is_open:
@@ -59,6 +131,7 @@ class WLEDDevice(OutputDevice):
             # Create UDP socket
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.socket.settimeout(self.timeout)
+            self._last_arr = None
             
             # Test connection by sending a blank frame
             self._send_test_packet()
@@ -99,6 +172,9 @@ class WLEDDevice(OutputDevice):
             
         # Convert to 0-255 range
         self.brightness = max(0, min(255, int(value * 255)))
+        if HAS_NUMPY:
+            self._lut = build_lut(self.gamma, self.brightness)
+        self._last_arr = None  # Every LED changes on the wire
         logger.debug(f"WLED brightness set to {self.brightness}")
         
     def draw_rgb_frame(self, width: int, height: int, rgb_data: List[Tuple[int, int, int]]) -> None:
@@ -108,7 +184,7 @@ class WLEDDevice(OutputDevice):
         Args:
             width: Frame width
             height: Frame height
-            rgb_data: Flattened list of RGB tuples
+            rgb_data: Flattened list of RGB tuples or (N, 3) uint8 array
         """
         if not self.is_open or not self.socket:
             raise RuntimeError("Device not open")
@@ -150,36 +226,20 @@ class WLEDDevice(OutputDevice):
             end_idx = min(start_idx + self.WARLS_MAX_LEDS, led_count)
             packet_led_count = end_idx - start_idx
             
-            # Build header
-            header = struct.pack(
-                '!BBHBBBHB',
+            # Write header straight into the send buffer
+            _WARLS_HEADER.pack_into(
+                self._sendbuf, 0,
                 self.WARLS_PROTOCOL,  # Protocol version
-                0,  # Timeout high byte
-                25,  # Timeout low byte (25 * 10ms = 250ms)
-                packet_led_count >> 8,  # LED count high byte
-                packet_led_count & 0xFF,  # LED count low byte
+                25,  # Timeout (25 * 10ms = 250ms)
+                packet_led_count,  # LED count
                 0,  # Channel
                 sequence,  # Sequence number
-                start_idx >> 8,  # Physical start high byte
-                start_idx & 0xFF  # Physical start low byte
+                start_idx  # Physical start
             )
+            length = self._write_payload(rgb_data, start_idx, end_idx, self.WARLS_HEADER_SIZE)
             
-            # Build data
-            data = bytearray()
-            for i in range(start_idx, end_idx):
-                if i < len(rgb_data):
-                    r, g, b = rgb_data[i]
-                    # Apply brightness
-                    r = (r * self.brightness) // 255
-                    g = (g * self.brightness) // 255
-                    b = (b * self.brightness) // 255
-                    data.extend([r, g, b])
-                else:
-                    data.extend([0, 0, 0])
-                    
             # Send packet
-            packet = header + data
-            self.socket.sendto(packet, (self.host, self.port))
+            self.socket.sendto(self._sendview[:length], (self.host, self.port))
             
             sequence = (sequence + 1) % 256
             
@@ -188,54 +248,108 @@ class WLEDDevice(OutputDevice):
         # DRGB: Simple RGB data, max 490 LEDs
         led_count = min(len(rgb_data), self.led_count, 490)
         
-        data = bytearray()
-        data.append(2)  # Protocol identifier for DRGB
-        
-        for i in range(led_count):
-            if i < len(rgb_data):
-                r, g, b = rgb_data[i]
-                # Apply brightness
-                r = (r * self.brightness) // 255
-                g = (g * self.brightness) // 255
-                b = (b * self.brightness) // 255
-                data.extend([r, g, b])
-            else:
-                data.extend([0, 0, 0])
+        self._sendbuf[0] = 2  # Protocol identifier for DRGB
+        length = self._write_payload(rgb_data, 0, led_count, 1)
                 
-        self.socket.sendto(data, (self.host, self.port))
+        self.socket.sendto(self._sendview[:length], (self.host, self.port))
         
     def _send_dnrgb_frame(self, rgb_data: List[Tuple[int, int, int]]) -> None:
-        """Send frame using DNRGB protocol"""
+        """Send frame using DNRGB protocol, resending only the spans that changed"""
         # DNRGB: [protocol, start_high, start_low, r, g, b, ...]
-        led_count = min(len(rgb_data), self.led_count, 489)  # 489 due to 3-byte header
+        led_count = min(len(rgb_data), self.led_count)
         
-        data = bytearray()
-        data.append(3)  # Protocol identifier for DNRGB
-        data.append(0)  # Start index high byte
-        data.append(0)  # Start index low byte
+        if HAS_NUMPY:
+            arr = np.array(rgb_data[:led_count], dtype=np.uint8).reshape(-1, 3)
+            spans = self._changed_spans(arr)
+            self._last_arr = arr
+            rgb_data = arr
+        else:
+            spans = [(0, led_count)]
+            
+        # Split each span into packets with an explicit start index
+        for start, end in spans:
+            for packet_start in range(start, end, self.DNRGB_MAX_LEDS):
+                packet_end = min(packet_start + self.DNRGB_MAX_LEDS, end)
+                _DNRGB_HEADER.pack_into(self._sendbuf, 0, self.DNRGB_PROTOCOL, packet_start)
+                length = self._write_payload(rgb_data, packet_start, packet_end,
+                                             _DNRGB_HEADER.size)
+                self.socket.sendto(self._sendview[:length], (self.host, self.port))
+                
+    def _changed_spans(self, arr: 'np.ndarray') -> List[Tuple[int, int]]:
+        """
+        Find the LED spans that differ from the last DNRGB frame
+        
+        Args:
+            arr: Frame as a (N, 3) uint8 array
+            
+        Returns:
+            List of (start, end) LED index spans to send
+        """
+        led_count = len(arr)
+        now = time.time()
+        last = self._last_arr
+        
+        # Periodic full frame keeps WLED in realtime mode on static scenes
+        if (last is None or last.shape != arr.shape or
+                now - self._last_full_time >= self.DNRGB_REFRESH_INTERVAL):
+            self._last_full_time = now
+            return [(0, led_count)]
+            
+        changed = (arr != last).any(axis=1)
+        changed_count = int(np.count_nonzero(changed))
+        if changed_count == 0:
+            return []
+        if changed_count * 2 > led_count:
+            self._last_full_time = now
+            return [(0, led_count)]
+            
+        # Run-length encode the change mask into [start, end) spans
+        edges = np.flatnonzero(np.diff(changed.astype(np.int8), prepend=0, append=0))
+        starts, ends = edges[0::2], edges[1::2]
         
-        for i in range(led_count):
-            if i < len(rgb_data):
-                r, g, b = rgb_data[i]
-                # Apply brightness
-                r = (r * self.brightness) // 255
-                g = (g * self.brightness) // 255
-                b = (b * self.brightness) // 255
-                data.extend([r, g, b])
+        # Merge spans separated by short gaps - a packet costs more than a few LEDs
+        keep = np.ones(len(starts), dtype=bool)
+        keep[1:] = starts[1:] - ends[:-1] > self.DNRGB_MERGE_GAP
+        return list(zip(starts[keep].tolist(), ends[np.append(keep[1:], True)].tolist()))
+        
+    def _write_payload(self, rgb_data: List[Tuple[int, int, int]],
+                       start: int, end: int, offset: int) -> int:
+        """
+        Write rgb_data[start:end] into the send buffer with gamma and brightness applied
+        
+        Args:
+            rgb_data: Flattened list of RGB tuples
+            start: First LED index
+            end: LED index to stop before
+            offset: Byte offset in the send buffer (header length)
+            
+        Returns:
+            Total packet length in bytes
+        """
+        stop = offset + (end - start) * 3
+        
+        if HAS_NUMPY:
+            arr = np.asarray(rgb_data[start:end], dtype=np.uint8).reshape(-1)
+            out = self._sendarr[offset:stop]
+            if self.gamma == 1.0 and self.brightness == 255:
+                out[:] = arr
             else:
-                data.extend([0, 0, 0])
-                
-        self.socket.sendto(data, (self.host, self.port))
+                # One table walk covers gamma, brightness and clamping
+                np.take(self._lut, arr, out=out, mode='clip')
+            return stop
+            
+        payload = bytes(chain.from_iterable(rgb_data[start:end]))
+        if self.brightness < 255:
+            payload = _swar_scale(payload, self.brightness)
+        self._sendview[offset:stop] = payload
+        return stop
         
     def _send_test_packet(self) -> None:
         """Send a test packet to verify connection"""
         try:
             # Send a single black pixel
             if self.protocol == 'WARLS':
-                header = struct.pack(
-                    '!BBHBBBHB',
-                    self.WARLS_PROTOCOL, 0, 25, 0, 1, 0, 0, 0, 0
-                )
+                header = _WARLS_HEADER.pack(self.WARLS_PROTOCOL, 25, 1, 0, 0, 0)
                 data = bytearray([0, 0, 0])
                 self.socket.sendto(header + data, (self.host, self.port))
             elif self.protocol == 'DRGB':
@@ -5,21 +5,61 @@ Supports WS2811/WS2812/WS2812B LED strips using Raspberry Pi GPIO.
 Requires rpi_ws281x library and root privileges.
 """
 
+import ctypes
 import json
 import logging
-from typing import List, Tuple, Dict, Any, Optional
+import numpy as np
+from typing import List, Tuple, Dict, Any, Optional, Union
 from . import OutputDevice, DeviceManager
+from ..gamma import build_lut
 
 logger = logging.getLogger(__name__)
 
+# Color channel (0=R, 1=G, 2=B, -1=spare) held by each byte of a packed
+# 0x00RRGGBB color, in memory order
+_PACKED_BYTE_CHANNEL = np.array([0x010203], dtype=np.uint32).view(np.uint8).astype(np.intp) - 1
+
+# Row offsets into a flat (4, 256) per-byte table
+_PACKED_BYTE_OFFSETS = np.arange(4, dtype=np.uint16) * 256
+
 try:
-    from rpi_ws281x import PixelStrip, Color
+    from rpi_ws281x import PixelStrip, Color, ws
     HAS_WS281X = True
+    
+    # Pixel order string to rpi_ws281x strip type
+    _ORDER_MAP = {
+        'RGB': ws.WS2811_STRIP_RGB,
+        'RBG': ws.WS2811_STRIP_RBG,
+        'GRB': ws.WS2811_STRIP_GRB,
+        'GBR': ws.WS2811_STRIP_GBR,
+        'BRG': ws.WS2811_STRIP_BRG,
+        'BGR': ws.WS2811_STRIP_BGR,
+    }
 except ImportError:
     HAS_WS281X = False
     logger.warning("rpi_ws281x library not available - WS2811 support disabled")
 
 
+def serpentine_coords(width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coordinates of each LED in a serpentine (zigzag) wired grid
+    
+    Args:
+        width: Grid width
+        height: Grid height
+        
+    Returns:
+        (x, y) int32 arrays in LED order
+    """
+    idx = np.arange(width * height, dtype=np.int32)
+    xs, ys = idx % width, idx // width
+    
+    # Odd rows run right to left
+    odd = (ys & 1).astype(bool)
+    xs[odd] = width - 1 - xs[odd]
+    return xs, ys
+
+
 class WS2811Device(OutputDevice):
     """WS2811 addressable LED implementation"""
     
@@ -32,7 +72,33 @@ class WS2811Device(OutputDevice):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.strip = None
-        self.pixel_map = None
+        
+        # LED coordinates as int32 arrays; pixel_map dicts are built on demand
+        self._map_x = None
+        self._map_y = None
+        self._pixel_map = None
+        
+        # Per-LED source pixel indices, cached for the last frame size
+        self._led_src_idx = None
+        self._led_oob = None
+        self._src_identity = False
+        self._src_dims = None
+        
+        # Address of the rpi_ws281x LED buffer (None = use setPixelColor)
+        self._led_buf_addr = None
+        
+        # Gamma + brightness table applied to packed colors (None = identity);
+        # brightness lives here rather than in the hardware so it costs one gather
+        self._lut = None
+        
+        # Per-channel color table (e.g. GammaCorrector.lut) fused with _lut,
+        # laid out per packed byte; rebuilt when either table changes
+        self._packed_lut = None
+        self._packed_lut_src = None
+        
+        # Last frame before the tables, redrawn when brightness changes
+        self._last_packed = None
+        self._last_color_lut = None
         
         # Extract WS2811-specific config
         ws2811_config = config.get('ws2811', {})
@@ -41,6 +107,7 @@ class WS2811Device(OutputDevice):
         self.count = ws2811_config.get('count', self.width * self.height)
         self.gpio_pin = ws2811_config.get('gpio', 18)
         self.brightness = ws2811_config.get('brightness', 128)
+        self.gamma = ws2811_config.get('gamma', 1.0)  # Strip gamma (render.gamma is applied upstream)
         self.pixel_order = ws2811_config.get('pixel_order', 'GRB')
         self.map_file = ws2811_config.get('map_file', None)
         
@@ -49,6 +116,7 @@ class WS2811Device(OutputDevice):
         self.dma = ws2811_config.get('dma', self.LED_DMA)
         self.invert = ws2811_config.get('invert', self.LED_INVERT)
         self.channel = ws2811_config.get('channel', self.LED_CHANNEL)
+        self._update_lut()
         
         # Load pixel mapping if provided
         if self.map_file:
@@ -57,14 +125,41 @@ class WS2811Device(OutputDevice):
             # Generate default linear mapping
             self._generate_default_map()
             
+    @property
+    def pixel_map(self) -> Optional[List[Dict[str, int]]]:
+        """LED coordinate mapping as [{"x": x, "y": y}, ...] - assign a new list to change it"""
+        if self._pixel_map is None and self._map_x is not None:
+            self._pixel_map = [{"x": x, "y": y}
+                               for x, y in zip(self._map_x.tolist(), self._map_y.tolist())]
+        return self._pixel_map
+        
+    @pixel_map.setter
+    def pixel_map(self, mapping: Optional[List[Dict[str, int]]]) -> None:
+        if mapping is None:
+            self._set_map_coords(None, None)
+            return
+        # Decode the dicts once here; frames only ever index the arrays
+        count = len(mapping)
+        xs = np.fromiter((m.get('x', 0) for m in mapping), dtype=np.int32, count=count)
+        ys = np.fromiter((m.get('y', 0) for m in mapping), dtype=np.int32, count=count)
+        self._set_map_coords(xs, ys)
+        self._pixel_map = mapping
+        
+    def _set_map_coords(self, xs: Optional[np.ndarray], ys: Optional[np.ndarray]) -> None:
+        """Replace the LED coordinate arrays and invalidate derived state"""
+        self._map_x = xs
+        self._map_y = ys
+        self._pixel_map = None
+        self._src_dims = None
+        
     def _load_pixel_map(self, map_file: str) -> None:
         """Load pixel coordinate mapping from JSON file"""
         try:
             with open(map_file, 'r') as f:
                 self.pixel_map = json.load(f)
                 
-            if len(self.pixel_map) != self.count:
-                logger.warning(f"Pixel map size ({len(self.pixel_map)}) doesn't match LED count ({self.count})")
+            if len(self._map_x) != self.count:
+                logger.warning(f"Pixel map size ({len(self._map_x)}) doesn't match LED count ({self.count})")
                 
             logger.info(f"Loaded pixel map from {map_file}")
             
@@ -74,30 +169,47 @@ class WS2811Device(OutputDevice):
             
     def _generate_default_map(self) -> None:
         """Generate default linear pixel mapping"""
-        self.pixel_map = []
-        for i in range(self.count):
-            x = i % self.width
-            y = i // self.width
-            self.pixel_map.append({"x": x, "y": y})
+        idx = np.arange(self.count, dtype=np.int32)
+        self._set_map_coords(idx % self.width, idx // self.width)
             
     def _get_pixel_order(self) -> int:
         """Convert pixel order string to rpi_ws281x constant"""
         if not HAS_WS281X:
             return 0
             
-        # Import color orders
-        from rpi_ws281x import ws
+        return _ORDER_MAP.get(self.pixel_order.upper(), _ORDER_MAP['GRB'])
+        
+    def _get_led_buffer(self) -> Optional[int]:
+        """Get the address of the strip's C LED buffer for bulk writes"""
+        try:
+            return int(ws.ws2811_channel_t_leds_get(self.strip._channel))
+        except Exception as e:
+            logger.debug(f"LED buffer not accessible, using setPixelColor: {e}")
+            return None
+            
+    def _build_src_index(self, width: int, height: int) -> None:
+        """
+        Precompute the source pixel index of every mapped LED for a frame size
+        
+        Args:
+            width: Frame width
+            height: Frame height
+        """
+        xs = self._map_x[:self.count]
+        ys = self._map_y[:self.count]
         
-        order_map = {
-            'RGB': ws.WS2811_STRIP_RGB,
-            'RBG': ws.WS2811_STRIP_RBG,
-            'GRB': ws.WS2811_STRIP_GRB,
-            'GBR': ws.WS2811_STRIP_GBR,
-            'BRG': ws.WS2811_STRIP_BRG,
-            'BGR': ws.WS2811_STRIP_BGR,
-        }
+        # Out of bounds LEDs read pixel 0 and are blanked after the gather
+        oob = (xs < 0) | (xs >= width) | (ys < 0) | (ys >= height)
+        src_idx = ys * width + xs
+        src_idx[oob] = 0
         
-        return order_map.get(self.pixel_order.upper(), ws.WS2811_STRIP_GRB)
+        self._led_src_idx = src_idx
+        self._led_oob = oob if oob.any() else None
+        self._src_dims = (width, height)
+        
+        # Linear wiring matching the frame layout needs no gather at all
+        self._src_identity = (self._led_oob is None and
+                              np.array_equal(src_idx, np.arange(len(src_idx))))
         
     def open(self) -> None:
         """Initialize WS2811 LED strip"""
@@ -116,13 +228,14 @@ class WS2811Device(OutputDevice):
                 self.freq_hz,
                 self.dma,
                 self.invert,
-                self.brightness,
+                255,  # Brightness is applied through self._lut
                 self.channel,
                 strip_type
             )
             
             # Initialize the strip
             self.strip.begin()
+            self._led_buf_addr = self._get_led_buffer()
             self.is_open = True
             
             # Clear strip on start
@@ -142,6 +255,7 @@ class WS2811Device(OutputDevice):
                 self._clear_strip()
                 self.strip._cleanup()
                 self.strip = None
+                self._led_buf_addr = None
                 self.is_open = False
                 logger.info("WS2811 strip closed")
             except Exception as e:
@@ -150,8 +264,13 @@ class WS2811Device(OutputDevice):
     def _clear_strip(self) -> None:
         """Turn off all LEDs"""
         if self.strip:
-            for i in range(self.count):
-                self.strip.setPixelColor(i, Color(0, 0, 0))
+            self._last_packed = None
+            if self._led_buf_addr is not None:
+                # 4 bytes per LED in the C buffer
+                ctypes.memset(self._led_buf_addr, 0, self.count * 4)
+            else:
+                for i in range(self.count):
+                    self.strip.setPixelColor(i, Color(0, 0, 0))
             self.strip.show()
             
     def set_brightness(self, value: float) -> None:
@@ -165,53 +284,163 @@ class WS2811Device(OutputDevice):
             raise RuntimeError("Device not open")
             
         # Convert to 0-255 range
-        brightness = max(0, min(255, int(value * 255)))
-        self.strip.setBrightness(brightness)
-        self.strip.show()
-        logger.debug(f"WS2811 brightness set to {brightness}")
+        self.brightness = max(0, min(255, int(value * 255)))
+        self._update_lut()
+        
+        # Re-render the current frame at the new brightness
+        if self._last_packed is not None:
+            self._show_packed(self._last_packed, self._last_color_lut)
+        logger.debug(f"WS2811 brightness set to {self.brightness}")
+        
+    def _update_lut(self) -> None:
+        """Rebuild the fused gamma + brightness table"""
+        if self.gamma == 1.0 and self.brightness >= 255:
+            self._lut = None
+        else:
+            self._lut = build_lut(self.gamma, self.brightness)
+        self._packed_lut = None
         
-    def draw_rgb_frame(self, width: int, height: int, rgb_data: List[Tuple[int, int, int]]) -> None:
+    def draw_rgb_frame(self, width: int, height: int,
+                       rgb_data: Union[List[Tuple[int, int, int]], np.ndarray]) -> None:
         """
         Draw RGB frame to LED strip
         
         Args:
             width: Frame width
             height: Frame height
-            rgb_data: Flattened list of RGB tuples
+            rgb_data: Flattened list of RGB tuples or uint8 RGB array
         """
         if not self.is_open or not self.strip:
             raise RuntimeError("Device not open")
             
         # Validate frame dimensions
-        if len(rgb_data) != width * height:
-            raise ValueError(f"RGB data size mismatch: expected {width*height}, got {len(rgb_data)}")
+        arr = np.asarray(rgb_data, dtype=np.uint8).reshape(-1, 3)
+        if len(arr) != width * height:
+            raise ValueError(f"RGB data size mismatch: expected {width*height}, got {len(arr)}")
             
-        # Map frame pixels to physical LEDs
-        for led_idx, mapping in enumerate(self.pixel_map):
-            if led_idx >= self.count:
-                break
-                
-            # Get mapped coordinates
-            x = mapping.get('x', 0)
-            y = mapping.get('y', 0)
-            
-            # Calculate source pixel index with bounds checking
-            if 0 <= x < width and 0 <= y < height:
-                src_idx = y * width + x
-                if src_idx < len(rgb_data):
-                    r, g, b = rgb_data[src_idx]
-                    # Note: Color() expects order based on strip type
-                    # The library handles the conversion internally
-                    self.strip.setPixelColor(led_idx, Color(r, g, b))
-                else:
-                    self.strip.setPixelColor(led_idx, Color(0, 0, 0))
-            else:
-                # Out of bounds - turn off LED
-                self.strip.setPixelColor(led_idx, Color(0, 0, 0))
+        self._show_packed(self._pack_leds(arr, width, height))
+        
+    def _show_packed(self, packed: np.ndarray, color_lut: Optional[np.ndarray] = None) -> None:
+        """
+        Apply color tables to packed colors, write them to the strip and show
+        
+        Args:
+            packed: uint32 0x00RRGGBB color per LED
+            color_lut: Optional (3, 256) uint8 per-channel table applied
+                before the strip's own gamma/brightness table
+        """
+        self._last_packed = packed
+        self._last_color_lut = color_lut
+        
+        if color_lut is not None:
+            # Both tables fused into one per-byte table, applied in one gather
+            table = self._packed_table(color_lut)
+            idx = np.ascontiguousarray(packed).view(np.uint8).reshape(-1, 4) + _PACKED_BYTE_OFFSETS
+            packed = np.take(table, idx, mode='clip').view(np.uint32).reshape(-1)
+        elif self._lut is not None:
+            # Every byte of a packed color is a channel (the spare byte is 0 and
+            # maps to 0), so the table applies to the raw bytes in one gather
+            packed = np.take(self._lut, packed.view(np.uint8), mode='clip').view(np.uint32)
+            
+        if self._led_buf_addr is not None:
+            # One copy into the C LED buffer replaces a call per LED
+            ctypes.memmove(self._led_buf_addr, packed.ctypes.data, packed.nbytes)
+        else:
+            set_pixel = self.strip.setPixelColor
+            for led_idx, color in enumerate(packed.tolist()):
+                set_pixel(led_idx, color)
                 
         # Update the strip
         self.strip.show()
         
+    def _packed_table(self, color_lut: np.ndarray) -> np.ndarray:
+        """Flat (1024,) table mapping each packed byte through color_lut, then _lut"""
+        # Tables are replaced rather than modified, so identity means unchanged
+        if self._packed_lut is None or color_lut is not self._packed_lut_src:
+            table = np.zeros((4, 256), dtype=np.uint8)
+            for pos, channel in enumerate(_PACKED_BYTE_CHANNEL.tolist()):
+                if channel >= 0:
+                    table[pos] = color_lut[channel]
+            if self._lut is not None:
+                table = self._lut[table]
+            self._packed_lut = table.reshape(-1)
+            self._packed_lut_src = color_lut
+        return self._packed_lut
+        
+    def _pack_leds(self, arr: np.ndarray, width: int, height: int) -> np.ndarray:
+        """
+        Gather frame pixels into LED order packed as 0x00RRGGBB like Color()
+        
+        Args:
+            arr: Frame(s) as (..., width * height, 3) uint8 array
+            width: Frame width
+            height: Frame height
+            
+        Returns:
+            uint32 array with one color per mapped LED (same leading dims as arr)
+        """
+        if self._src_dims != (width, height):
+            self._build_src_index(width, height)
+            
+        # The library handles strip color order internally
+        if self._src_identity:
+            leds = arr[..., :len(self._led_src_idx), :].astype(np.uint32)
+        else:
+            leds = arr[..., self._led_src_idx, :].astype(np.uint32)
+        if self._led_oob is not None:
+            leds[..., self._led_oob, :] = 0
+        return (leds[..., 0] << 16) | (leds[..., 1] << 8) | leds[..., 2]
+        
+    def pack_frames(self, frames: np.ndarray, batch_size: int = 64) -> np.ndarray:
+        """
+        Pack a stack of frames into the strip's native LED buffer layout
+        
+        Args:
+            frames: Frames as numpy array (N, H, W, 3)
+            batch_size: Frames gathered per NumPy pass (bounds temporary memory)
+            
+        Returns:
+            (N, LEDs) uint32 array; each row is ready for draw_packed()
+        """
+        count, height, width = frames.shape[:3]
+        flat = np.asarray(frames, dtype=np.uint8).reshape(count, height * width, 3)
+        
+        if self._src_dims != (width, height):
+            self._build_src_index(width, height)
+        packed = np.empty((count, len(self._led_src_idx)), dtype=np.uint32)
+        
+        for start in range(0, count, batch_size):
+            packed[start:start + batch_size] = self._pack_leds(
+                flat[start:start + batch_size], width, height)
+                
+        return packed
+        
+    def pack_frame(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Pack an (H, W, 3) frame into the strip's native LED buffer layout
+        
+        Args:
+            frame: Frame as numpy array (H, W, 3)
+            
+        Returns:
+            uint32 buffer ready for draw_packed()
+        """
+        return self.pack_frames(frame[np.newaxis])[0]
+        
+    def draw_packed(self, packed: np.ndarray, color_lut: Optional[np.ndarray] = None) -> None:
+        """
+        Draw a frame prepared by pack_frame() or pack_frames()
+        
+        Args:
+            packed: Contiguous uint32 LED buffer
+            color_lut: Optional (3, 256) uint8 per-channel color correction
+                (e.g. GammaCorrector.lut), since packed frames are uncorrected
+        """
+        if not self.is_open or not self.strip:
+            raise RuntimeError("Device not open")
+            
+        self._show_packed(packed, color_lut)
+        
     def create_serpentine_map(self, width: int, height: int) -> List[Dict[str, int]]:
         """
         Create a serpentine (zigzag) mapping for a grid of LEDs
@@ -223,19 +452,18 @@ class WS2811Device(OutputDevice):
         Returns:
             List of coordinate mappings
         """
-        mapping = []
+        xs, ys = serpentine_coords(width, height)
+        return [{"x": x, "y": y} for x, y in zip(xs.tolist(), ys.tolist())]
         
-        for y in range(height):
-            if y % 2 == 0:
-                # Even rows go left to right
-                for x in range(width):
-                    mapping.append({"x": x, "y": y})
-            else:
-                # Odd rows go right to left
-                for x in range(width - 1, -1, -1):
-                    mapping.append({"x": x, "y": y})
-                    
-        return mapping
+    def use_serpentine_map(self, width: int, height: int) -> None:
+        """
+        Switch this strip to a serpentine mapping without building coordinate dicts
+        
+        Args:
+            width: Grid width
+            height: Grid height
+        """
+        self._set_map_coords(*serpentine_coords(width, height))
 
 
 # Register device type
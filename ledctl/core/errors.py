@@ -2,9 +2,13 @@
 Error handling and custom exceptions for the LED Control System.
 """
 import logging
+import time
 import traceback
+from collections import Counter
+from threading import Lock
+from functools import lru_cache
 from typing import Optional, Dict, Any
-from flask import jsonify, render_template, request
+from flask import g, jsonify, request
 from werkzeug.exceptions import HTTPException
 
 logger = logging.getLogger(__name__)
@@ -43,9 +47,79 @@ class FileProcessingError(LEDControlError):
         super().__init__(message, code='FILE_ERROR', details={'filename': filename, 'reason': reason})
 
 
+class _ErrorLogThrottle:
+    """Logs the first occurrence of each error in full and repeats as periodic counts."""
+    
+    MAX_SEEN = 1024  # Distinct errors remembered before starting over
+    
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.seen = set()
+        self.counts = Counter()
+        self.last_flush = time.monotonic()
+        self.lock = Lock()
+    
+    def record(self, key) -> bool:
+        """
+        Count an error occurrence.
+        
+        Args:
+            key: Identity of the error (type and message)
+            
+        Returns:
+            True if this is the first occurrence and should be logged in full
+        """
+        summary = None
+        with self.lock:
+            first = key not in self.seen
+            if first:
+                if len(self.seen) >= self.MAX_SEEN:
+                    self.seen.clear()
+                self.seen.add(key)
+            else:
+                self.counts[key] += 1
+                
+            now = time.monotonic()
+            if self.counts and now - self.last_flush >= self.interval:
+                summary = {f"{name}: {message}": count
+                           for (name, message), count in self.counts.items()}
+                self.counts.clear()
+                self.last_flush = now
+                
+        if summary:
+            logger.error(f"Repeated unexpected errors since last report: {summary}")
+        return first
+
+
+_error_log = _ErrorLogThrottle()
+
+
+def _wants_json() -> bool:
+    """Whether the client prefers JSON over HTML, parsed once per request and kept on g."""
+    wants_json = g.get('wants_json')
+    if wants_json is None:
+        accept = request.accept_mimetypes
+        wants_json = g.wants_json = accept.accept_json and not accept.accept_html
+    return wants_json
+
+
 def register_error_handlers(app, socketio):
     """Register error handlers with Flask app."""
     
+    error_template = None
+    
+    def render_error_page(**context) -> str:
+        """Render error.html from a template compiled once (re-read in auto-reload mode)."""
+        nonlocal error_template
+        if error_template is None or app.jinja_env.auto_reload:
+            error_template = app.jinja_env.get_template('error.html')
+        return error_template.render(**context)
+    
+    @lru_cache(maxsize=64)
+    def render_static_error_page(error_code: int, error_message: str) -> str:
+        """Pages that depend only on code and message are rendered once and reused."""
+        return render_error_page(error_code=error_code, error_message=error_message)
+    
     @app.errorhandler(LEDControlError)
     def handle_led_error(error):
         """Handle custom LED control errors."""
@@ -54,16 +128,16 @@ def register_error_handlers(app, socketio):
         response = {
             'error': error.message,
             'code': error.code,
-            'details': error.details
+            'details': error.details or {}  # JSON can't encode the read-only empty mapping
         }
         
         # Emit error to websocket clients
         socketio.emit('error', response)
         
-        if request.accept_mimetypes.accept_json and not request.accept_mimetypes.accept_html:
+        if _wants_json():
             return jsonify(response), 400
         
-        return render_template('error.html', error=error), 400
+        return render_error_page(error=error), 400
     
     @app.errorhandler(HTTPException)
     def handle_http_error(error):
@@ -75,21 +149,17 @@ def register_error_handlers(app, socketio):
             'code': f'HTTP_{error.code}'
         }
         
-        if request.accept_mimetypes.accept_json and not request.accept_mimetypes.accept_html:
+        if _wants_json():
             return jsonify(response), error.code
             
-        return render_template('error.html', 
-                             error_code=error.code,
-                             error_message=error.description), error.code
+        return render_static_error_page(error.code, error.description), error.code
     
     @app.errorhandler(Exception)
     def handle_unexpected_error(error):
         """Handle unexpected errors."""
-        logger.exception("Unexpected error occurred")
-        
-        # Get traceback for logging
-        tb = traceback.format_exc()
-        logger.error(f"Traceback:\n{tb}")
+        # Full traceback once per distinct error, then aggregated counts
+        if _error_log.record((type(error).__name__, str(error)[:200])):
+            logger.exception("Unexpected error occurred")
         
         # Don't expose internal errors in production
         if app.config.get('ENV') == 'production':
@@ -97,7 +167,7 @@ def register_error_handlers(app, socketio):
             details = {}
         else:
             message = str(error)
-            details = {'traceback': tb.split('\n')}
+            details = {'traceback': traceback.format_exc().split('\n')}
         
         response = {
             'error': message,
@@ -108,14 +178,13 @@ def register_error_handlers(app, socketio):
         # Emit critical error to websocket clients
         socketio.emit('error', {'error': 'System error occurred', 'code': 'CRITICAL'})
         
-        if request.accept_mimetypes.accept_json and not request.accept_mimetypes.accept_html:
+        if _wants_json():
             return jsonify(response), 500
             
-        return render_template('error.html',
-                             error_code=500,
-                             error_message=message,
-                             show_details=(app.config.get('ENV') != 'production'),
-                             details=details), 500
+        return render_error_page(error_code=500,
+                                 error_message=message,
+                                 show_details=(app.config.get('ENV') != 'production'),
+                                 details=details), 500
     
     @app.errorhandler(413)
     def handle_file_too_large(error):
@@ -131,12 +200,10 @@ def register_error_handlers(app, socketio):
             'details': {'max_size_mb': max_size}
         }
         
-        if request.accept_mimetypes.accept_json and not request.accept_mimetypes.accept_html:
+        if _wants_json():
             return jsonify(response), 413
             
-        return render_template('error.html',
-                             error_code=413,
-                             error_message=message), 413
+        return render_static_error_page(413, message), 413
 
 
 def safe_execute(func, *args, error_message="Operation failed", **kwargs):
@@ -6,16 +6,80 @@ into RGB frame data for LED output.
 """
 
 import os
+import shutil
 import logging
-from typing import List, Tuple, Optional, Iterator, Any, Dict
+import subprocess
+from typing import List, Tuple, Optional, Iterator, Any, Dict, Union
 from PIL import Image, ImageSequence
 import numpy as np
 import cv2
 from threading import Lock
-from collections import deque
+from collections import deque, OrderedDict
+from .gamma import _RGB_DTYPE
 
 logger = logging.getLogger(__name__)
 
+# ffmpeg decodes and scales video in one pass; OpenCV is the fallback
+FFMPEG_PATH = shutil.which('ffmpeg')
+
+# Scale methods to ffmpeg swscale flags
+_FFMPEG_SCALE_FLAGS = {
+    'NEAREST': 'neighbor',
+    'LINEAR': 'bilinear',
+    'CUBIC': 'bicubic',
+    'LANCZOS': 'lanczos',
+    'AREA': 'area',
+}
+
+
+def _pil_to_array(img: Image.Image) -> np.ndarray:
+    """
+    View an RGB PIL image as an (H, W, 3) uint8 array
+    
+    tobytes() is a single memcpy out of PIL's buffer; the returned (read-only)
+    array owns that bytes object, so it stays valid after the image is closed.
+    """
+    return np.frombuffer(img.tobytes(), dtype=np.uint8).reshape(img.height, img.width, 3)
+
+
+class _RGBOutput:
+    """Conversion of (H, W, 3) frames to the flat RGB forms output devices take"""
+    
+    # uint8 buffer reused when frames need clipping, sized on first use
+    _u8_scratch = None
+    
+    def to_rgb_ndarray(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Convert numpy frame to flat RGB array for output devices
+        
+        Args:
+            frame: Numpy array (H, W, 3)
+            
+        Returns:
+            Contiguous (N, 3) uint8 array - a view of frame when it is already
+            uint8, otherwise a buffer reused by the next call
+        """
+        if frame.dtype != np.uint8:
+            if self._u8_scratch is None or self._u8_scratch.shape != frame.shape:
+                self._u8_scratch = np.empty(frame.shape, dtype=np.uint8)
+            np.clip(frame, 0, 255, out=self._u8_scratch, casting='unsafe')
+            frame = self._u8_scratch
+        return np.ascontiguousarray(frame).reshape(-1, 3)
+        
+    def to_rgb_list(self, frame: np.ndarray) -> List[Tuple[int, int, int]]:
+        """
+        Convert numpy frame to flat RGB tuple list
+        
+        Deprecated: output devices accept the array from to_rgb_ndarray directly.
+        
+        Args:
+            frame: Numpy array (H, W, 3)
+            
+        Returns:
+            Flat list of RGB tuples
+        """
+        return self.to_rgb_ndarray(frame).view(_RGB_DTYPE).reshape(-1).tolist()
+
 
 class FrameProcessor:
     """Processes various media formats into RGB frames"""
@@ -23,7 +87,8 @@ class FrameProcessor:
     SUPPORTED_IMAGE_FORMATS = {'.gif', '.png', '.jpg', '.jpeg', '.bmp', '.webp'}
     SUPPORTED_VIDEO_FORMATS = {'.mp4', '.avi', '.mov', '.webm', '.mkv'}
     
-    def __init__(self, target_width: int, target_height: int, config: Dict[str, Any] = None):
+    def __init__(self, target_width: int, target_height: int, config: Dict[str, Any] = None,
+                 device: Any = None):
         """
         Initialize frame processor
         
@@ -31,20 +96,25 @@ class FrameProcessor:
             target_width: Target frame width
             target_height: Target frame height
             config: Rendering configuration
+            device: Output device; frames are prepacked if it provides pack_frames()
         """
         self.target_width = target_width
         self.target_height = target_height
         self.config = config or {}
+        self.device = device
         
         # Get render settings
         render_config = self.config.get('render', {})
         self.scale_method = render_config.get('scale', 'LANCZOS')
+        # Method used when shrinking video frames; AREA is faster and alias-free
+        self.downscale_method = render_config.get('downscale', self.scale_method)
         self.fps_cap = render_config.get('fps_cap', 60)
         
-        # Cache for loaded frames
-        self.frame_cache = {}
+        # LRU cache of loaded animations, bounded by frame memory
+        self.frame_cache = OrderedDict()  # file_path -> (animation, nbytes)
         self.cache_lock = Lock()
-        self.max_cache_size = 100  # Maximum cached animations
+        self.cache_bytes = 0
+        self.max_cache_bytes = int(render_config.get('cache_mb', 256) * 1024 * 1024)
         
     def load_media(self, file_path: str) -> Optional['MediaAnimation']:
         """
@@ -64,7 +134,8 @@ class FrameProcessor:
         with self.cache_lock:
             if file_path in self.frame_cache:
                 logger.debug(f"Loading from cache: {file_path}")
-                return self.frame_cache[file_path]
+                self.frame_cache.move_to_end(file_path)
+                return self.frame_cache[file_path][0]
                 
         ext = os.path.splitext(file_path)[1].lower()
         
@@ -80,14 +151,22 @@ class FrameProcessor:
                 logger.error(f"Unsupported file format: {ext}")
                 return None
                 
+            # Pack frames into the device's native buffer format once
+            animation.pack_for(self.device)
+                
             # Add to cache
             with self.cache_lock:
-                self.frame_cache[file_path] = animation
+                if file_path in self.frame_cache:
+                    self.cache_bytes -= self.frame_cache.pop(file_path)[1]
+                size = animation.nbytes
+                self.frame_cache[file_path] = (animation, size)
+                self.cache_bytes += size
                 
-                # Evict oldest if cache full
-                if len(self.frame_cache) > self.max_cache_size:
-                    oldest = next(iter(self.frame_cache))
-                    del self.frame_cache[oldest]
+                # Evict least recently used until within budget (always keep the newest)
+                while self.cache_bytes > self.max_cache_bytes and len(self.frame_cache) > 1:
+                    oldest, (_, oldest_size) = self.frame_cache.popitem(last=False)
+                    self.cache_bytes -= oldest_size
+                    logger.debug(f"Evicted from cache: {oldest}")
                     
             return animation
             
@@ -102,14 +181,9 @@ class FrameProcessor:
         
         with Image.open(file_path) as img:
             for frame in ImageSequence.Iterator(img):
-                # Convert to RGB
-                rgb_frame = frame.convert('RGB')
-                
-                # Resize to target dimensions
-                rgb_frame = self._resize_image(rgb_frame)
-                
-                # Convert to numpy array
-                frame_array = np.array(rgb_frame)
+                # Convert to RGB array, then resize with OpenCV
+                frame_array = _pil_to_array(frame.convert('RGB'))
+                frame_array = self._resize_frame(frame_array)
                 frames.append(frame_array)
                 
                 # Get frame duration (default 100ms if not specified)
@@ -128,16 +202,13 @@ class FrameProcessor:
             rgb_img = self._resize_image(rgb_img)
             
             # Convert to numpy array
-            frame_array = np.array(rgb_img)
+            frame_array = _pil_to_array(rgb_img)
             
         # Single frame with 1 second duration
         return MediaAnimation([frame_array], [1.0], file_path)
         
     def _load_video(self, file_path: str) -> 'MediaAnimation':
         """Load video file"""
-        frames = []
-        durations = []
-        
         cap = cv2.VideoCapture(file_path)
         
         if not cap.isOpened():
@@ -149,6 +220,71 @@ class FrameProcessor:
             
         frame_duration = 1.0 / min(fps, self.fps_cap)
         
+        frames = None
+        if FFMPEG_PATH:
+            source_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                           int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            try:
+                frames = self._decode_video_ffmpeg(file_path, source_size)
+            except FileNotFoundError:
+                logger.warning(f"ffmpeg not found at {FFMPEG_PATH}, falling back to OpenCV")
+            except (OSError, ValueError) as e:
+                logger.warning(f"ffmpeg decode failed, falling back to OpenCV: {e}")
+                
+        if not frames:
+            frames = self._decode_video_cv2(cap)
+            
+        cap.release()
+        
+        if not frames:
+            raise ValueError(f"No frames extracted from video: {file_path}")
+            
+        return MediaAnimation(frames, [frame_duration] * len(frames), file_path)
+        
+    def _decode_video_ffmpeg(self, file_path: str,
+                             source_size: Tuple[int, int]) -> List[np.ndarray]:
+        """
+        Decode video with ffmpeg scaling straight to the target size as RGB
+        
+        Args:
+            file_path: Path to video file
+            source_size: Source (width, height), used to pick the scaler
+            
+        Returns:
+            List of (H, W, 3) uint8 frames
+        """
+        width, height = self.target_width, self.target_height
+        frame_size = width * height * 3
+        
+        method = self.scale_method
+        if source_size[0] >= width and source_size[1] >= height:
+            method = self.downscale_method  # Match _resize_frame when downscaling
+        flags = _FFMPEG_SCALE_FLAGS.get(method, 'lanczos')
+            
+        cmd = [
+            FFMPEG_PATH, '-v', 'error', '-nostdin', '-i', file_path, '-an',
+            '-vf', f'scale={width}:{height}:flags={flags}',
+            '-pix_fmt', 'rgb24', '-f', 'rawvideo', '-'
+        ]
+        
+        # Only stdout is piped; a second unread pipe could fill up and stall ffmpeg
+        frames = []
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+            while True:
+                data = proc.stdout.read(frame_size)
+                if len(data) < frame_size:
+                    break
+                frames.append(np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3))
+            
+        if proc.returncode != 0:
+            raise ValueError(f"ffmpeg exited with {proc.returncode}")
+            
+        return frames
+        
+    def _decode_video_cv2(self, cap: 'cv2.VideoCapture') -> List[np.ndarray]:
+        """Decode video with OpenCV, resizing each frame to the target size"""
+        frames = []
+        
         while True:
             ret, frame = cap.read()
             if not ret:
@@ -161,14 +297,8 @@ class FrameProcessor:
             rgb_frame = self._resize_frame(rgb_frame)
             
             frames.append(rgb_frame)
-            durations.append(frame_duration)
-            
-        cap.release()
-        
-        if not frames:
-            raise ValueError(f"No frames extracted from video: {file_path}")
             
-        return MediaAnimation(frames, durations, file_path)
+        return frames
         
     def _resize_image(self, img: Image.Image) -> Image.Image:
         """Resize PIL Image to target dimensions"""
@@ -198,9 +328,13 @@ class FrameProcessor:
             'LINEAR': cv2.INTER_LINEAR,
             'CUBIC': cv2.INTER_CUBIC,
             'LANCZOS': cv2.INTER_LANCZOS4,
+            'AREA': cv2.INTER_AREA,
         }
         
-        interpolation = interpolation_map.get(self.scale_method, cv2.INTER_LANCZOS4)
+        method = self.scale_method
+        if frame.shape[0] >= self.target_height and frame.shape[1] >= self.target_width:
+            method = self.downscale_method
+        interpolation = interpolation_map.get(method, cv2.INTER_LANCZOS4)
         
         return cv2.resize(frame, (self.target_width, self.target_height), 
                          interpolation=interpolation)
@@ -209,32 +343,87 @@ class FrameProcessor:
         """Clear frame cache"""
         with self.cache_lock:
             self.frame_cache.clear()
+            self.cache_bytes = 0
             logger.info("Frame cache cleared")
 
 
-class MediaAnimation:
+class MediaAnimation(_RGBOutput):
     """Container for loaded animation frames"""
     
-    def __init__(self, frames: List[np.ndarray], durations: List[float], source: str):
+    def __init__(self, frames: Union[List[np.ndarray], np.ndarray],
+                 durations: List[float], source: str):
         """
         Initialize animation
         
         Args:
-            frames: List of numpy arrays (H, W, 3)
+            frames: List of numpy arrays (H, W, 3) or a stacked (N, H, W, 3) array
             durations: List of frame durations in seconds
             source: Source file path
         """
-        self.frames = frames
+        # One contiguous block; frames[i] is a zero-copy view
+        if isinstance(frames, np.ndarray):
+            self.frames = frames
+        elif frames:
+            self.frames = np.stack(frames)
+        else:
+            self.frames = np.empty((0, 0, 0, 3), dtype=np.uint8)
         self.durations = durations
         self.source = source
         self.total_duration = sum(durations)
         self.frame_count = len(frames)
         
+        # Device-native (N, LEDs) frame buffers and the device they were packed for
+        self.packed_frames = None
+        self.packed_for = None
+        
+        # Constant frame duration (typical for video) lets playback advance in O(1)
+        self._const_duration = (durations[0] if durations and durations[0] > 0 and
+                                all(d == durations[0] for d in durations) else None)
+        
+        # Frame end times for O(log N) time lookups
+        self._cum_durations = np.cumsum(np.asarray(durations, dtype=np.float64))
+        
         # Current playback state
         self.current_frame = 0
         self.frame_time = 0.0
         self.loop = True
         
+    @property
+    def nbytes(self) -> int:
+        """Memory held by frame data, including packed device buffers"""
+        total = self.frames.nbytes
+        if self.packed_frames is not None:
+            total += self.packed_frames.nbytes
+        return total
+        
+    def pack_for(self, device) -> None:
+        """
+        Pack frames for a device, dropping any buffers packed for another one
+        
+        Args:
+            device: Output device; frames are packed only if it provides pack_frames()
+        """
+        if device is not None and hasattr(device, 'pack_frames'):
+            self.packed_frames = device.pack_frames(self.frames)
+            self.packed_for = device
+        else:
+            self.packed_frames = None
+            self.packed_for = None
+            
+    def get_packed_frame(self, device) -> Optional[np.ndarray]:
+        """
+        Get the current frame's packed buffer if it was packed for this device
+        
+        Args:
+            device: Output device about to draw the frame
+            
+        Returns:
+            Packed LED buffer, or None if the frame must go through draw_rgb_frame()
+        """
+        if self.packed_frames is None or self.packed_for is not device:
+            return None
+        return self.packed_frames[self.current_frame]
+        
     def get_frame_at_time(self, time: float) -> Tuple[np.ndarray, int]:
         """
         Get frame at specific time
@@ -245,21 +434,16 @@ class MediaAnimation:
         Returns:
             (frame, frame_index)
         """
-        if not self.frames:
+        if self.frame_count == 0:
             return None, -1
             
         if self.loop:
             time = time % self.total_duration
             
-        accumulated_time = 0.0
-        
-        for i, duration in enumerate(self.durations):
-            if accumulated_time <= time < accumulated_time + duration:
-                return self.frames[i], i
-            accumulated_time += duration
-            
-        # Return last frame if beyond duration
-        return self.frames[-1], len(self.frames) - 1
+        # First frame ending after time; past the end returns the last frame
+        idx = int(np.searchsorted(self._cum_durations, time, side='right'))
+        idx = min(idx, self.frame_count - 1)
+        return self.frames[idx], idx
         
     def get_next_frame(self, delta_time: float) -> np.ndarray:
         """
@@ -273,6 +457,17 @@ class MediaAnimation:
         """
         self.frame_time += delta_time
         
+        if self._const_duration:
+            # Advance any number of frames in one step
+            steps = int(self.frame_time // self._const_duration)
+            if steps:
+                self.frame_time -= steps * self._const_duration
+                if self.loop:
+                    self.current_frame = (self.current_frame + steps) % self.frame_count
+                else:
+                    self.current_frame = min(self.current_frame + steps, self.frame_count - 1)
+            return self.frames[self.current_frame]
+            
         # Check if we need to advance frame
         while self.frame_time >= self.durations[self.current_frame]:
             self.frame_time -= self.durations[self.current_frame]
@@ -291,27 +486,9 @@ class MediaAnimation:
         """Reset animation to beginning"""
         self.current_frame = 0
         self.frame_time = 0.0
-        
-    def to_rgb_list(self, frame: np.ndarray) -> List[Tuple[int, int, int]]:
-        """
-        Convert numpy frame to flat RGB tuple list
-        
-        Args:
-            frame: Numpy array (H, W, 3)
-            
-        Returns:
-            Flat list of RGB tuples
-        """
-        # Ensure frame is uint8
-        if frame.dtype != np.uint8:
-            frame = np.clip(frame, 0, 255).astype(np.uint8)
-            
-        # Flatten and convert to tuples
-        flat = frame.reshape(-1, 3)
-        return [tuple(pixel) for pixel in flat]
 
 
-class ProceduralAnimation:
+class ProceduralAnimation(_RGBOutput):
     """Base class for procedural animations"""
     
     def __init__(self, width: int, height: int, fps: float = 30):
@@ -329,16 +506,3 @@ class ProceduralAnimation:
     def generate_frame(self, time: float) -> np.ndarray:
         """Generate frame at given time - override in subclasses"""
         raise NotImplementedError
-        
-    def to_rgb_list(self, frame: np.ndarray) -> List[Tuple[int, int, int]]:
-        """Convert frame to RGB tuple list - optimized"""
-        # Ensure frame is uint8
-        if frame.dtype != np.uint8:
-            frame = np.clip(frame, 0, 255).astype(np.uint8)
-        # Use numpy's memory view for efficient conversion
-        flat = frame.reshape(-1, 3)
-        # Pre-allocate list for better performance
-        result = [None] * len(flat)
-        for i, pixel in enumerate(flat):
-            result[i] = (int(pixel[0]), int(pixel[1]), int(pixel[2]))
-        return result
\ No newline at end of file
@@ -11,9 +11,52 @@ Provides color correction functionality for LED displays including:
 import numpy as np
 from typing import List, Tuple, Union, Optional
 import logging
+from functools import lru_cache
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Offsets of each channel's table in the flat (768,) LUT
+_CHANNEL_OFFSETS = np.array([0, 256, 512], dtype=np.uint16)
+
+# High-precision (12-bit) table size for float pipelines
+HP_LUT_SIZE = 4096
+_HP_CHANNEL_OFFSETS = np.array([0, HP_LUT_SIZE, 2 * HP_LUT_SIZE], dtype=np.int32)
+
+# Packed RGB record; .tolist() on a view of this emits (r, g, b) tuples in C
+_RGB_DTYPE = np.dtype([('r', 'u1'), ('g', 'u1'), ('b', 'u1')])
+
+if HAS_NUMBA:
+    @lru_cache(maxsize=8)
+    def _numba_kernel_for(height: int, width: int):
+        """
+        Compile a LUT kernel specialized for one (height, width) frame shape
+        
+        The loop bounds are closure constants, so Numba compiles them in as
+        literals and hoists the LUT row addresses out of the pixel loop.
+        Panel size is fixed by config, so in practice one kernel is built.
+        """
+        @njit(parallel=True, boundscheck=False, fastmath=True)
+        def kernel(frame, lut, out):
+            for y in prange(height):
+                for x in range(width):
+                    out[y, x, 0] = lut[0, frame[y, x, 0]]
+                    out[y, x, 1] = lut[1, frame[y, x, 1]]
+                    out[y, x, 2] = lut[2, frame[y, x, 2]]
+        return kernel
+
 
 class GammaCorrector:
     """Handles gamma correction and color adjustments for LED output"""
@@ -29,15 +72,31 @@ class GammaCorrector:
         self.rgb_balance = [1.0, 1.0, 1.0]
         self.brightness = 1.0
         
-        # Pre-calculate lookup table for performance
+        # Per-channel LUT scale: rgb_balance * brightness, kept by the setters
+        self._scale = np.ones(3, dtype=np.float64)
+        
+        # Nesting depth of batch_update(); LUT rebuilds wait until it is 0
+        self._batch_depth = 0
+        
+        # Pre-calculate lookup table for performance: (3, 256) plus a flat view
         self._lut = None
+        self._lut_flat = None
+        self._lut_cv = None  # (1, 256, 3) layout for cv2.LUT
+        self._lut_hp = None  # (3, 4096) float32, built on first correct_frame_float
+        self._lut_hp_flat = None
         self._lut_gamma = None
         self._update_lut()
         
+        # Output buffer reused across correct_frame calls
+        self._scratch = None
+        
     def set_gamma(self, gamma: float) -> None:
         """Update gamma correction value"""
-        self.gamma = max(0.1, min(5.0, gamma))  # Clamp to reasonable range
-        self._update_lut()
+        gamma = max(0.1, min(5.0, gamma))  # Clamp to reasonable range
+        if gamma == self.gamma:
+            return
+        self.gamma = gamma
+        self._refresh_lut()
         logger.debug(f"Gamma set to {self.gamma}")
         
     def set_rgb_balance(self, rgb: List[float]) -> None:
@@ -47,12 +106,16 @@ class GammaCorrector:
         Args:
             rgb: List of three multipliers [R, G, B], typically 0.0-2.0
         """
-        self.rgb_balance = [
+        rgb_balance = [
             max(0.0, min(2.0, rgb[0])),
             max(0.0, min(2.0, rgb[1])),
             max(0.0, min(2.0, rgb[2]))
         ]
-        self._update_lut()
+        if rgb_balance == self.rgb_balance:
+            return
+        self.rgb_balance = rgb_balance
+        self._update_scale()
+        self._refresh_lut()
         logger.debug(f"RGB balance set to {self.rgb_balance}")
         
     def set_brightness(self, brightness: float) -> None:
@@ -62,38 +125,81 @@ class GammaCorrector:
         Args:
             brightness: Brightness value 0.0-1.0
         """
-        self.brightness = max(0.0, min(1.0, brightness))
-        self._update_lut()
+        brightness = max(0.0, min(1.0, brightness))
+        if brightness == self.brightness:
+            return
+        self.brightness = brightness
+        self._update_scale()
+        self._refresh_lut()
         logger.debug(f"Brightness set to {self.brightness}")
         
-    def _update_lut(self) -> None:
-        """Update lookup table for fast gamma correction"""
-        # Create separate LUTs for each channel
-        self._lut = []
+    @contextmanager
+    def batch_update(self):
+        """
+        Defer LUT rebuilds while changing several settings
         
-        for channel in range(3):
-            lut = np.zeros(256, dtype=np.uint8)
-            
-            for i in range(256):
-                # Normalize to 0-1
-                normalized = i / 255.0
-                
-                # Apply gamma correction
-                corrected = np.power(normalized, self.gamma)
-                
-                # Apply RGB balance
-                corrected *= self.rgb_balance[channel]
-                
-                # Apply brightness
-                corrected *= self.brightness
-                
-                # Convert back to 0-255 and clamp
-                lut[i] = int(np.clip(corrected * 255, 0, 255))
+        Setters called inside the block only record their values; the
+        tables are rebuilt once on exit.
+        
+        Example:
+            with corrector.batch_update():
+                corrector.set_gamma(2.4)
+                corrector.set_brightness(0.5)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._update_lut()
                 
-            self._lut.append(lut)
+    def _refresh_lut(self) -> None:
+        """Rebuild the tables now unless a batch_update() is pending"""
+        if not self._batch_depth:
+            self._update_lut()
+        
+    @property
+    def lut(self) -> np.ndarray:
+        """Current (3, 256) uint8 per-channel table; replaced, not modified, on change"""
+        return self._lut
+        
+    @property
+    def is_identity(self) -> bool:
+        """True when correction leaves every pixel unchanged"""
+        return (self.gamma == 1.0 and self.brightness == 1.0 and
+                self.rgb_balance == [1.0, 1.0, 1.0])
+        
+    def _update_scale(self) -> None:
+        """Fold RGB balance and brightness into one per-channel multiplier"""
+        self._scale = np.asarray(self.rgb_balance, dtype=np.float64) * self.brightness
+        
+    def _update_lut(self) -> None:
+        """Update lookup table for fast gamma correction"""
+        # Gamma curve once, then scaled per channel by RGB balance and brightness
+        levels = np.arange(256, dtype=np.float64) / 255.0
+        curve = np.power(levels, self.gamma)
+        scale = self._scale[:, None]
+        corrected = curve[None, :] * scale
+        
+        # One contiguous (3, 256) table, a row per channel
+        self._lut = np.clip(corrected * 255, 0, 255).astype(np.uint8)
+        self._lut_flat = self._lut.reshape(-1)
+        if HAS_CV2:
+            self._lut_cv = np.ascontiguousarray(self._lut.T).reshape(1, 256, 3)
             
+        # The float table is rebuilt on demand by correct_frame_float
+        self._lut_hp = None
+        self._lut_hp_flat = None
         self._lut_gamma = self.gamma
         
+    def _build_lut_hp(self) -> None:
+        """Build the 12-bit float table; 48KB, stays cache-resident"""
+        hp_levels = np.arange(HP_LUT_SIZE, dtype=np.float64) / (HP_LUT_SIZE - 1)
+        hp_corrected = np.power(hp_levels, self.gamma)[None, :] * self._scale[:, None]
+        self._lut_hp = np.clip(hp_corrected, 0.0, 1.0).astype(np.float32)
+        self._lut_hp_flat = self._lut_hp.reshape(-1)
+        
     def correct_frame(self, frame: np.ndarray, in_place: bool = False) -> np.ndarray:
         """
         Apply gamma correction and color adjustments to a frame
@@ -103,20 +209,64 @@ class GammaCorrector:
             in_place: Modify the input frame directly if True
             
         Returns:
-            Corrected frame
+            Corrected frame. Unless in_place is set this is an internal
+            buffer that the next call overwrites; copy it to keep it.
         """
-        if not in_place:
-            frame = frame.copy()
-            
         # Ensure frame is uint8
         if frame.dtype != np.uint8:
             frame = np.clip(frame, 0, 255).astype(np.uint8)
             
-        # Apply lookup table to each channel
-        for c in range(3):
-            frame[:, :, c] = self._lut[c][frame[:, :, c]]
+        if in_place:
+            out = frame
+        else:
+            if self._scratch is None or self._scratch.shape != frame.shape:
+                self._scratch = np.empty(frame.shape, dtype=np.uint8)
+            out = self._scratch
             
-        return frame
+        # OpenCV's SIMD LUT kernel maps all channels of an (H, W, 3)
+        # image in one call
+        if HAS_CV2 and frame.ndim == 3 and frame.shape[2] == 3 and out.flags.c_contiguous:
+            cv2.LUT(np.ascontiguousarray(frame), self._lut_cv, dst=out)
+            return out
+
+        # Without OpenCV, a compiled row-parallel loop is the next best
+        if HAS_NUMBA and frame.ndim == 3 and frame.shape[2] == 3:
+            _numba_kernel_for(frame.shape[0], frame.shape[1])(frame, self._lut, out)
+            return out
+
+        # All three channels in one gather: pixel value + channel offset
+        # indexes the flat (768,) table. uint8 + offset is always in range,
+        # so mode='clip' just skips the bounds check and error buffering.
+        return np.take(self._lut_flat, frame + _CHANNEL_OFFSETS, out=out, mode='clip')
+        
+    def correct_frame_float(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Apply gamma correction and color adjustments to a float frame
+        
+        Looks values up in the 12-bit table with linear interpolation
+        between neighbouring entries, so float pipelines keep precision
+        that the 8-bit table would quantize away.
+        
+        Args:
+            frame: Frame as float array (..., 3) with values 0.0-1.0
+            
+        Returns:
+            Corrected float32 frame with values 0.0-1.0
+        """
+        if self._lut_hp_flat is None:
+            self._build_lut_hp()
+            
+        pos = np.clip(frame, 0.0, 1.0).astype(np.float32) * np.float32(HP_LUT_SIZE - 1)
+        idx = np.minimum(pos.astype(np.int32), HP_LUT_SIZE - 2)
+        frac = pos - idx
+        idx += _HP_CHANNEL_OFFSETS
+        
+        lo = np.take(self._lut_hp_flat, idx, mode='clip')
+        hi = np.take(self._lut_hp_flat, idx + 1, mode='clip')
+        hi -= lo
+        hi *= frac
+        hi += lo
+        return hi
         
     def correct_rgb_list(self, rgb_list: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
         """
@@ -128,15 +278,23 @@ class GammaCorrector:
         Returns:
             Corrected RGB list
         """
-        corrected = []
+        return self.correct_rgb_array(rgb_list).view(_RGB_DTYPE).reshape(-1).tolist()
+        
+    def correct_rgb_array(self, rgb_data: Union[List[Tuple[int, int, int]], np.ndarray]) -> np.ndarray:
+        """
+        Apply corrections to a flat run of RGB values
         
-        for r, g, b in rgb_list:
-            r = self._lut[0][r]
-            g = self._lut[1][g]
-            b = self._lut[2][b]
-            corrected.append((r, g, b))
+        Args:
+            rgb_data: List of RGB tuples or (N, 3) array
             
-        return corrected
+        Returns:
+            Corrected (N, 3) uint8 array
+        """
+        arr = np.asarray(rgb_data)
+        if arr.dtype != np.uint8:
+            arr = np.clip(arr, 0, 255).astype(np.uint8)
+        arr = arr.reshape(-1, 3)
+        return np.take(self._lut_flat, arr + _CHANNEL_OFFSETS, mode='clip')
         
     def correct_rgb(self, r: int, g: int, b: int) -> Tuple[int, int, int]:
         """
@@ -170,6 +328,10 @@ class ColorTemperature:
         10000: (0.78, 0.85, 1.00), # Blue sky
     }
     
+    # Sorted kelvin keys and matching (N, 3) multipliers for searchsorted
+    _TEMPS_SORTED = np.array(sorted(TEMPERATURES), dtype=np.float64)
+    _TEMPS_RGB = np.array(list(map(TEMPERATURES.get, sorted(TEMPERATURES))), dtype=np.float64)
+    
     @classmethod
     def get_rgb_multipliers(cls, kelvin: int) -> Tuple[float, float, float]:
         """
@@ -184,40 +346,28 @@ class ColorTemperature:
         # Clamp to valid range
         kelvin = max(2000, min(10000, kelvin))
         
-        # Find surrounding temperatures for interpolation
-        temps = sorted(cls.TEMPERATURES.keys())
-        
         # Exact match
         if kelvin in cls.TEMPERATURES:
             return cls.TEMPERATURES[kelvin]
             
-        # Find surrounding values
-        lower_temp = None
-        upper_temp = None
-        
-        for i, temp in enumerate(temps):
-            if temp < kelvin:
-                lower_temp = temp
-            elif temp > kelvin:
-                upper_temp = temp
-                break
-                
+        # Binary search for the upper bracketing temperature
+        temps = cls._TEMPS_SORTED
+        upper = int(np.searchsorted(temps, kelvin))
+        
         # Edge cases
-        if lower_temp is None:
-            return cls.TEMPERATURES[temps[0]]
-        if upper_temp is None:
-            return cls.TEMPERATURES[temps[-1]]
+        if upper == 0:
+            return cls.TEMPERATURES[int(temps[0])]
+        if upper == len(temps):
+            return cls.TEMPERATURES[int(temps[-1])]
             
         # Linear interpolation
-        t = (kelvin - lower_temp) / (upper_temp - lower_temp)
+        lower_temp = temps[upper - 1]
+        t = (kelvin - lower_temp) / (temps[upper] - lower_temp)
         
-        lower_rgb = cls.TEMPERATURES[lower_temp]
-        upper_rgb = cls.TEMPERATURES[upper_temp]
+        lower_rgb = cls._TEMPS_RGB[upper - 1]
+        upper_rgb = cls._TEMPS_RGB[upper]
         
-        return tuple(
-            lower_rgb[i] + t * (upper_rgb[i] - lower_rgb[i])
-            for i in range(3)
-        )
+        return tuple((lower_rgb + t * (upper_rgb - lower_rgb)).tolist())
         
     @classmethod
     def apply_temperature(cls, gamma_corrector: GammaCorrector, kelvin: int) -> None:
@@ -231,12 +381,9 @@ class ColorTemperature:
         multipliers = cls.get_rgb_multipliers(kelvin)
         
         # Combine with existing RGB balance
-        combined = [
-            gamma_corrector.rgb_balance[i] * multipliers[i]
-            for i in range(3)
-        ]
+        combined = np.multiply(gamma_corrector.rgb_balance, multipliers)
         
-        gamma_corrector.set_rgb_balance(combined)
+        gamma_corrector.set_rgb_balance(combined.tolist())
 
 
 class AutoWhiteBalance:
@@ -255,19 +402,36 @@ class AutoWhiteBalance:
         Returns:
             (r, g, b) balance multipliers
         """
-        # Find bright pixels (potential white points)
-        brightness = np.mean(frame, axis=2)
-        threshold = np.percentile(brightness, percentile)
+        pixels = frame.reshape(-1, 3)
+        if pixels.size == 0:
+            return (1.0, 1.0, 1.0)
         
-        # Get pixels above threshold
-        bright_mask = brightness > threshold
-        bright_pixels = frame[bright_mask]
+        # Find bright pixels (potential white points). Channel sums rank
+        # pixels the same as channel means without a float array.
+        if pixels.dtype == np.uint8:
+            brightness = pixels[:, 0].astype(np.uint16)
+            brightness += pixels[:, 1]
+            brightness += pixels[:, 2]
+        else:
+            brightness = pixels.sum(axis=1)
+        
+        # Linear-interpolated percentile from an O(N) partition of the two
+        # neighbouring ranks instead of a full sort
+        rank = (percentile / 100.0) * (brightness.size - 1)
+        lo = int(np.floor(rank))
+        hi = min(lo + 1, brightness.size - 1)
+        part = np.partition(brightness, [lo, hi])
+        threshold = part[lo] + (float(part[hi]) - float(part[lo])) * (rank - lo)
+        
+        # Get pixels above threshold (only the top slice of the frame)
+        bright_pixels = pixels[brightness > threshold]
         
         if len(bright_pixels) == 0:
             return (1.0, 1.0, 1.0)
             
-        # Calculate average of bright pixels
-        avg_bright = np.mean(bright_pixels, axis=0)
+        # Calculate average of bright pixels; uint8 sums are exact
+        sums = bright_pixels.sum(axis=0, dtype=np.uint64 if pixels.dtype == np.uint8 else np.float64)
+        avg_bright = sums / len(bright_pixels)
         
         # Calculate multipliers to balance to neutral gray
         max_val = np.max(avg_bright)
@@ -284,6 +448,25 @@ class AutoWhiteBalance:
         return tuple(multipliers)
 
 
+def build_lut(gamma: float = 1.0, brightness: int = 255) -> np.ndarray:
+    """
+    Build a 256-entry uint8 lookup table for per-channel output correction
+    
+    Drivers apply the table with a single gather (np.take(lut, frame))
+    instead of evaluating pow() per pixel.
+    
+    Args:
+        gamma: Gamma exponent (1.0 = linear)
+        brightness: Brightness scale 0-255 applied after gamma
+        
+    Returns:
+        Lookup table as uint8 array of shape (256,)
+    """
+    levels = np.arange(256, dtype=np.float64) / 255.0
+    curve = np.rint(np.power(levels, gamma) * 255).astype(np.uint16)
+    return (curve * brightness // 255).astype(np.uint8)
+
+
 # Convenience function for creating pre-configured correctors
 def create_corrector(config: dict) -> GammaCorrector:
     """
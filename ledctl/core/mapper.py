@@ -8,12 +8,20 @@ for non-standard layouts (serpentine, circular, custom mappings).
 import json
 import logging
 import numpy as np
-from typing import List, Tuple, Dict, Any, Optional
+from typing import List, Tuple, Dict, Any, Optional, Union
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
 
+def _as_rgb_u8(data: Union[List[Tuple[int, int, int]], np.ndarray]) -> np.ndarray:
+    """View pixel data as (N, 3) uint8, clamping other dtypes"""
+    arr = np.asarray(data)
+    if arr.dtype != np.uint8:
+        arr = np.clip(arr, 0, 255).astype(np.uint8)
+    return arr.reshape(-1, 3)
+
+
 class MappingType(Enum):
     """Common LED layout mapping types"""
     LINEAR = "linear"           # Standard left-to-right, top-to-bottom
@@ -31,11 +39,16 @@ class PixelMapper:
         self.mapping_type = mapping_type
         self.pixel_count = width * height
         
-        # Mapping from frame position to LED index
-        self.forward_map: List[int] = []
+        # Mapping from frame position to LED index (int32)
+        self.forward_map = np.empty(0, dtype=np.int32)
+        
+        # Gather indices for map_frame; invalid entries point at a black
+        # sentinel row one past the end of the frame
+        self._gather_idx = np.empty(0, dtype=np.int32)
+        self._needs_sentinel = False
         
-        # Mapping from LED index to frame position
-        self.reverse_map: Dict[int, Tuple[int, int]] = {}
+        # Mapping from LED index to frame position, built on first use
+        self._reverse_map: Optional[np.ndarray] = None
         
         # Initialize mapping
         self._build_mapping()
@@ -49,103 +62,95 @@ class PixelMapper:
         elif self.mapping_type == MappingType.SPIRAL:
             self._build_spiral_mapping()
         # CUSTOM mapping loaded separately via load_custom_mapping()
+        self._update_gather_index()
+        
+    def _update_gather_index(self):
+        """Refresh the gather index from forward_map"""
+        self.forward_map = np.asarray(self.forward_map, dtype=np.int32)
+        valid = (self.forward_map >= 0) & (self.forward_map < self.pixel_count)
+        self._needs_sentinel = not valid.all()
+        self._gather_idx = np.where(valid, self.forward_map, self.pixel_count).astype(np.int32)
+        self._reverse_map = None
+        
+    @property
+    def reverse_map(self) -> np.ndarray:
+        """
+        Mapping from LED index to frame position as a (pixel_count, 2) array
+        
+        Row i holds (x, y) for LED i, or (-1, -1) when its index is invalid.
+        """
+        if self._reverse_map is None:
+            valid = (self.forward_map >= 0) & (self.forward_map < self.pixel_count)
+            coords = np.column_stack((self.forward_map % self.width,
+                                      self.forward_map // self.width)).astype(np.int32)
+            coords[~valid] = -1
+            self._reverse_map = coords
+        return self._reverse_map
             
     def _build_linear_mapping(self):
         """Standard left-to-right, top-to-bottom mapping"""
-        self.forward_map = list(range(self.pixel_count))
-        
-        for y in range(self.height):
-            for x in range(self.width):
-                index = y * self.width + x
-                self.reverse_map[index] = (x, y)
+        self.forward_map = np.arange(self.pixel_count, dtype=np.int32)
                 
     def _build_serpentine_mapping(self):
         """Serpentine (zig-zag) mapping for LED strips"""
-        self.forward_map = []
-        
-        for y in range(self.height):
-            if y % 2 == 0:
-                # Even rows: left to right
-                for x in range(self.width):
-                    index = y * self.width + x
-                    self.forward_map.append(index)
-                    self.reverse_map[index] = (x, y)
-            else:
-                # Odd rows: right to left
-                for x in range(self.width - 1, -1, -1):
-                    index = y * self.width + (self.width - 1 - x)
-                    self.forward_map.append(index)
-                    self.reverse_map[index] = (x, y)
+        # Row-major indices with every odd row reversed
+        index = np.arange(self.pixel_count, dtype=np.int32).reshape(self.height, self.width)
+        index[1::2] = index[1::2, ::-1]
+        self.forward_map = index.reshape(-1)
                     
     def _build_spiral_mapping(self):
         """Spiral mapping from center outward"""
-        self.forward_map = []
-        visited = set()
+        # Walk right, down, left, up with run lengths 1, 1, 2, 2, 3, 3, ...
+        # until the spiral's square covers the whole frame
+        runs = np.repeat(np.arange(1, max(self.width, self.height) + 2), 2)
+        directions = np.tile(np.array([[1, 0], [0, 1], [-1, 0], [0, -1]], dtype=np.int64),
+                             (len(runs) // 4 + 1, 1))[:len(runs)]
+        steps = np.repeat(directions, runs, axis=0)
         
-        # Start from center
-        cx, cy = self.width // 2, self.height // 2
-        x, y = cx, cy
+        # Absolute positions: the center followed by the cumulative steps.
+        # A spiral never revisits a cell, so the in-bounds positions are
+        # already unique and in visiting order.
+        path = np.vstack(([[self.width // 2, self.height // 2]],
+                          np.array([self.width // 2, self.height // 2]) + np.cumsum(steps, axis=0)))
+        xs, ys = path[:, 0], path[:, 1]
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        xs = xs[inside][:self.pixel_count]
+        ys = ys[inside][:self.pixel_count]
         
-        # Directions: right, down, left, up
-        dx = [1, 0, -1, 0]
-        dy = [0, 1, 0, -1]
-        direction = 0
-        steps = 1
-        step_count = 0
-        direction_changes = 0
-        
-        while len(visited) < self.pixel_count:
-            # Add current position if valid
-            if 0 <= x < self.width and 0 <= y < self.height:
-                pos = (x, y)
-                if pos not in visited:
-                    visited.add(pos)
-                    index = len(self.forward_map)
-                    self.forward_map.append(y * self.width + x)
-                    self.reverse_map[index] = (x, y)
-                    
-            # Move to next position
-            x += dx[direction]
-            y += dy[direction]
-            step_count += 1
-            
-            # Change direction when needed
-            if step_count >= steps:
-                step_count = 0
-                direction = (direction + 1) % 4
-                direction_changes += 1
-                
-                # Increase steps every two direction changes
-                if direction_changes % 2 == 0:
-                    steps += 1
+        self.forward_map = (ys * self.width + xs).astype(np.int32)
                     
     def map_pixel(self, x: int, y: int) -> int:
         """Map 2D coordinate to LED index"""
         if 0 <= x < self.width and 0 <= y < self.height:
-            frame_index = y * self.width + x
-            if frame_index < len(self.forward_map):
-                return self.forward_map[frame_index]
+            try:
+                # .item() returns a Python int straight from the int32 buffer
+                return self.forward_map.item(y * self.width + x)
+            except IndexError:
+                pass  # CUSTOM mapping not loaded yet
         return -1
         
-    def map_frame(self, frame_data: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
-        """Remap entire frame data to physical LED order"""
-        if len(frame_data) != self.pixel_count:
-            logger.error(f"Frame size mismatch: expected {self.pixel_count}, got {len(frame_data)}")
-            return frame_data
-            
-        # Create remapped frame
-        remapped = [None] * self.pixel_count
-        
-        for i, led_index in enumerate(self.forward_map):
-            if 0 <= led_index < len(frame_data):
-                remapped[i] = frame_data[led_index]
-            else:
-                remapped[i] = (0, 0, 0)  # Black for invalid indices
-                
-        # Replace None values with black
-        remapped = [(0, 0, 0) if pixel is None else pixel for pixel in remapped]
+    def map_frame(self, frame_data: Union[List[Tuple[int, int, int]], np.ndarray]) -> np.ndarray:
+        """
+        Remap entire frame data to physical LED order
         
-        return remapped
+        Returns a contiguous (N, 3) uint8 array, ready for tobytes().
+        """
+        arr = _as_rgb_u8(frame_data)
+            
+        if len(arr) != self.pixel_count:
+            logger.error(f"Frame size mismatch: expected {self.pixel_count}, got {len(arr)}")
+            return np.ascontiguousarray(arr)
+            
+        if len(self._gather_idx) != self.pixel_count:
+            self._update_gather_index()
+            
+        if not self._needs_sentinel:
+            return np.take(arr, self._gather_idx, axis=0)
+            
+        # Pad with one black row for out-of-range indices
+        safe = np.zeros((self.pixel_count + 1, 3), dtype=np.uint8)
+        safe[:self.pixel_count] = arr
+        return np.take(safe, self._gather_idx, axis=0)
         
     def load_custom_mapping(self, filepath: str):
         """Load custom mapping from JSON file"""
@@ -162,16 +167,9 @@ class PixelMapper:
             if len(mapping) != self.pixel_count:
                 raise ValueError(f"Mapping size mismatch: expected {self.pixel_count}, got {len(mapping)}")
                 
-            self.forward_map = mapping
+            self.forward_map = np.asarray(mapping, dtype=np.int32)
             self.mapping_type = MappingType.CUSTOM
-            
-            # Rebuild reverse map
-            self.reverse_map.clear()
-            for physical_index, frame_index in enumerate(mapping):
-                if 0 <= frame_index < self.pixel_count:
-                    y = frame_index // self.width
-                    x = frame_index % self.width
-                    self.reverse_map[physical_index] = (x, y)
+            self._update_gather_index()
                     
             logger.info(f"Loaded custom mapping from {filepath}")
             
@@ -180,6 +178,7 @@ class PixelMapper:
             # Fall back to linear mapping
             self.mapping_type = MappingType.LINEAR
             self._build_linear_mapping()
+            self._update_gather_index()
             
     def save_mapping(self, filepath: str):
         """Save current mapping to JSON file"""
@@ -187,7 +186,7 @@ class PixelMapper:
             'width': self.width,
             'height': self.height,
             'type': self.mapping_type.value,
-            'mapping': self.forward_map,
+            'mapping': self.forward_map.tolist(),
             'description': 'LED pixel mapping - maps frame indices to physical LED indices'
         }
         
@@ -203,8 +202,8 @@ class PixelMapper:
             'height': self.height,
             'pixel_count': self.pixel_count,
             'mapping_type': self.mapping_type.value,
-            'forward_map_sample': self.forward_map[:10] if len(self.forward_map) > 10 else self.forward_map,
-            'reverse_map_count': len(self.reverse_map)
+            'forward_map_sample': self.forward_map[:10].tolist(),
+            'reverse_map_count': int(np.count_nonzero(self.reverse_map[:, 0] >= 0))
         }
 
 
@@ -239,56 +238,79 @@ class MultiPanelMapper:
         
         logger.info(f"Added panel at ({x},{y}) size {width}x{height} rotation {rotation}")
         
-    def map_frame(self, frame: np.ndarray) -> Dict[int, List[Tuple[int, int, int]]]:
-        """Map a frame to multiple panels"""
+    def map_frame(self, frame: np.ndarray) -> Dict[int, np.ndarray]:
+        """
+        Map a frame to multiple panels
+        
+        Returns panel index -> contiguous (N, 3) uint8 array in LED order.
+        """
+        frame_h, frame_w = frame.shape[:2]
+        flat = _as_rgb_u8(frame)
+        padded = None
         panel_data = {}
         
         for i, panel in enumerate(self.panels):
-            # Extract panel region from frame
-            panel_frame = self._extract_panel_region(frame, panel)
+            # Region extract, rotation and pixel mapping fused in one gather
+            gather_idx, needs_sentinel = self._panel_gather_index(panel, frame_h, frame_w)
             
-            # Apply rotation if needed
-            if panel['rotation'] != 0:
-                panel_frame = self._rotate_frame(panel_frame, panel['rotation'])
-                
-            # Convert to RGB list and apply panel's pixel mapping
-            h, w = panel_frame.shape[:2]
-            rgb_list = []
-            for y in range(h):
-                for x in range(w):
-                    pixel = panel_frame[y, x]
-                    rgb_list.append((int(pixel[0]), int(pixel[1]), int(pixel[2])))
-                    
-            # Apply panel's pixel mapping
-            mapped_data = panel['mapper'].map_frame(rgb_list)
-            panel_data[i] = mapped_data
+            if needs_sentinel:
+                if padded is None:
+                    # Black sentinel row for cells outside the frame
+                    padded = np.zeros((len(flat) + 1, 3), dtype=np.uint8)
+                    padded[:-1] = flat
+                panel_data[i] = np.take(padded, gather_idx, axis=0)
+            else:
+                panel_data[i] = np.take(flat, gather_idx, axis=0)
             
         return panel_data
         
-    def _extract_panel_region(self, frame: np.ndarray, panel: Dict[str, Any]) -> np.ndarray:
-        """Extract the region of the frame for a specific panel"""
+    def _panel_gather_index(self, panel: Dict[str, Any],
+                            frame_h: int, frame_w: int) -> Tuple[np.ndarray, bool]:
+        """
+        Get the flat frame offsets for a panel's LEDs, in LED order
+        
+        Built once per frame size and panel mapping and cached on the panel.
+        Offsets equal to frame_h * frame_w select a black sentinel row.
+        """
+        mapper = panel['mapper']
+        if len(mapper._gather_idx) != mapper.pixel_count:
+            mapper._update_gather_index()
+            
+        cached = panel.get('gather_idx')
+        if (cached is not None and panel['gather_shape'] == (frame_h, frame_w)
+                and panel['gather_src'] is mapper._gather_idx):
+            return cached, panel['gather_sentinel']
+            
         x, y = panel['x'], panel['y']
         w, h = panel['width'], panel['height']
+        sentinel = frame_h * frame_w
         
-        # Handle out of bounds
-        frame_h, frame_w = frame.shape[:2]
-        x_end = min(x + w, frame_w)
-        y_end = min(y + h, frame_h)
+        # Frame offset of every panel cell, sentinel where it falls outside
+        rows = np.arange(y, y + h)
+        cols = np.arange(x, x + w)
+        grid = rows[:, None] * frame_w + cols[None, :]
+        inside = (rows < frame_h)[:, None] & (cols < frame_w)[None, :]
+        grid = np.where(inside, grid, sentinel)
         
-        if x >= frame_w or y >= frame_h:
-            # Panel is completely outside frame
-            return np.zeros((h, w, 3), dtype=np.uint8)
-            
-        # Extract region
-        region = frame[y:y_end, x:x_end]
+        # Apply rotation if needed
+        if panel['rotation'] != 0:
+            grid = self._rotate_frame(grid, panel['rotation'])
+        offsets = grid.reshape(-1)
         
-        # Pad if necessary
-        if region.shape[0] < h or region.shape[1] < w:
-            padded = np.zeros((h, w, 3), dtype=np.uint8)
-            padded[:region.shape[0], :region.shape[1]] = region
-            region = padded
+        # Apply panel's pixel mapping; invalid LED indices go to the sentinel
+        if mapper.pixel_count == len(offsets):
+            offsets = np.append(offsets, sentinel)[mapper._gather_idx]
+        else:
+            logger.error(f"Frame size mismatch: expected {mapper.pixel_count}, got {len(offsets)}")
             
-        return region
+        gather_idx = offsets.astype(np.intp)
+        needs_sentinel = bool((gather_idx == sentinel).any())
+        
+        panel['gather_idx'] = gather_idx
+        panel['gather_shape'] = (frame_h, frame_w)
+        panel['gather_src'] = mapper._gather_idx
+        panel['gather_sentinel'] = needs_sentinel
+        return gather_idx, needs_sentinel
         
     def _rotate_frame(self, frame: np.ndarray, rotation: int) -> np.ndarray:
         """Rotate frame by specified degrees (0, 90, 180, 270)"""
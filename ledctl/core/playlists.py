@@ -6,16 +6,33 @@ configurable transitions and repeat modes.
 """
 
 import os
+import json
 import time
+import sys
+import random
 import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import List, Optional, Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 
 from .frames import FrameProcessor
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Playlist timestamps are only ever subtracted, so use a clock that
+# cannot jump when NTP or the user adjusts the wall clock
+_now = time.monotonic
+
 
 class PlayMode(Enum):
     """Playlist playback modes"""
@@ -32,15 +49,26 @@ class TransitionType(Enum):
     SLIDE = "slide"         # Slide transition
 
 
-@dataclass
+_TRANSITION_MAP = {t.value: t for t in TransitionType}
+
+# Slotted dataclasses need Python 3.10+; older interpreters get a plain one
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class PlaylistItem:
-    """Single item in a playlist"""
+    """Single item in a playlist (immutable; use Playlist.update_item to change one)"""
     filename: str
     duration: Optional[float] = None  # Play duration in seconds (None = full)
     transition: TransitionType = TransitionType.NONE
     transition_duration: float = 0.5  # Transition duration in seconds
 
 
+def _transition_from_value(value: str) -> TransitionType:
+    """Look up a TransitionType by value (raises ValueError if unknown)"""
+    return _TRANSITION_MAP.get(value) or TransitionType(value)
+
+
 class Playlist:
     """Manages a sequence of animations"""
     
@@ -53,6 +81,17 @@ class Playlist:
         self.start_time = 0
         self.item_start_time = 0
         
+        # When the current item's duration runs out; None if it plays in full
+        self._current_deadline: Optional[float] = None
+        
+        # RANDOM mode plays a shuffled bag of indices, refilled when used up,
+        # so every item plays once per cycle
+        self._random_bag: List[int] = []
+        self._random_cursor = 0
+        
+        # Serialized items for to_dict(); rebuilt only after the items change
+        self._items_cache: Optional[List[Dict[str, Any]]] = None
+        
     def add_item(self, filename: str, duration: Optional[float] = None,
                  transition: TransitionType = TransitionType.NONE,
                  transition_duration: float = 0.5):
@@ -64,8 +103,17 @@ class Playlist:
             transition_duration=transition_duration
         )
         self.items.append(item)
+        self._invalidate_cache()
         logger.info(f"Added {filename} to playlist {self.name}")
         
+    def add_items(self, items: List[PlaylistItem]):
+        """Append several items at once, invalidating and logging a single time"""
+        if not items:
+            return
+        self.items.extend(items)
+        self._invalidate_cache()
+        logger.info(f"Added {len(items)} items to playlist {self.name}")
+        
     def remove_item(self, index: int):
         """Remove item at index"""
         if 0 <= index < len(self.items):
@@ -74,18 +122,42 @@ class Playlist:
             # Adjust current index if needed
             if self.current_index >= len(self.items) and self.items:
                 self.current_index = 0
+            self._invalidate_cache()
                 
     def clear(self):
         """Clear all items"""
         self.items.clear()
         self.current_index = 0
+        self._invalidate_cache()
         
+    def update_item(self, index: int, **changes):
+        """Replace fields of the item at index, e.g. update_item(0, duration=5)"""
+        if 0 <= index < len(self.items):
+            self.items[index] = replace(self.items[index], **changes)
+            self._invalidate_cache()
+            
     def move_item(self, from_index: int, to_index: int):
         """Move item from one position to another"""
         if (0 <= from_index < len(self.items) and 
             0 <= to_index < len(self.items)):
             item = self.items.pop(from_index)
             self.items.insert(to_index, item)
+            self._invalidate_cache()
+            
+    def _invalidate_cache(self):
+        """Drop state derived from the item list after it changes"""
+        self._items_cache = None
+        self._random_bag = []
+        self._random_cursor = 0
+        self._update_deadline()
+        
+    def _update_deadline(self):
+        """Recompute the current item's deadline after the index or start time moves"""
+        item = self.get_current_item()
+        if item and item.duration:
+            self._current_deadline = self.item_start_time + item.duration
+        else:
+            self._current_deadline = None
             
     def get_current_item(self) -> Optional[PlaylistItem]:
         """Get current playlist item"""
@@ -102,8 +174,8 @@ class Playlist:
             # Stay on current item
             pass
         elif self.play_mode == PlayMode.RANDOM:
-            import random
-            self.current_index = random.randint(0, len(self.items) - 1)
+            self.current_index = self.peek_next_index()
+            self._random_cursor += 1
         else:
             # ONCE or LOOP mode
             self.current_index += 1
@@ -114,7 +186,39 @@ class Playlist:
                     self.current_index = len(self.items) - 1
                     self.is_playing = False
                     
-        self.item_start_time = time.time()
+        self.item_start_time = _now()
+        self._update_deadline()
+        
+    def peek_next_index(self) -> Optional[int]:
+        """
+        Index next_item() will move to, without advancing
+        
+        Returns:
+            Next index, or None when playback would stop (end of ONCE)
+        """
+        if not self.items:
+            return None
+            
+        if self.play_mode == PlayMode.LOOP_SINGLE:
+            return self.current_index
+        if self.play_mode == PlayMode.RANDOM:
+            if self._random_cursor >= len(self._random_bag):
+                self._refill_random_bag()
+            return self._random_bag[self._random_cursor]
+            
+        # ONCE or LOOP mode
+        if self.current_index + 1 < len(self.items):
+            return self.current_index + 1
+        return 0 if self.play_mode == PlayMode.LOOP else None
+        
+    def _refill_random_bag(self):
+        """Shuffle a fresh cycle of indices for RANDOM mode"""
+        self._random_bag = list(range(len(self.items)))
+        random.shuffle(self._random_bag)
+        # Don't repeat the current item back-to-back across cycles
+        if len(self._random_bag) > 1 and self._random_bag[0] == self.current_index:
+            self._random_bag[0], self._random_bag[1] = self._random_bag[1], self._random_bag[0]
+        self._random_cursor = 0
         
     def previous_item(self):
         """Go to previous item"""
@@ -128,36 +232,34 @@ class Playlist:
             else:
                 self.current_index = 0
                 
-        self.item_start_time = time.time()
+        self.item_start_time = _now()
+        self._update_deadline()
         
     def should_advance(self) -> bool:
         """Check if it's time to advance to next item"""
-        if not self.is_playing or not self.items:
-            return False
-            
-        current_item = self.get_current_item()
-        if current_item and current_item.duration:
-            elapsed = time.time() - self.item_start_time
-            return elapsed >= current_item.duration
-            
-        return False
+        deadline = self._current_deadline
+        return self.is_playing and deadline is not None and _now() >= deadline
         
     def start(self):
         """Start playlist playback"""
         self.is_playing = True
-        self.start_time = time.time()
-        self.item_start_time = time.time()
+        self.start_time = self.item_start_time = _now()
         self.current_index = 0
+        self._update_deadline()
         
     def stop(self):
         """Stop playlist playback"""
         self.is_playing = False
         
     def to_dict(self) -> Dict[str, Any]:
-        """Convert playlist to dictionary"""
-        return {
-            'name': self.name,
-            'items': [
+        """
+        Convert playlist to dictionary
+        
+        The items list is cached and shared between calls; treat it as
+        read-only.
+        """
+        if self._items_cache is None:
+            self._items_cache = [
                 {
                     'filename': item.filename,
                     'duration': item.duration,
@@ -165,7 +267,10 @@ class Playlist:
                     'transition_duration': item.transition_duration
                 }
                 for item in self.items
-            ],
+            ]
+        return {
+            'name': self.name,
+            'items': self._items_cache,
             'play_mode': self.play_mode.value,
             'current_index': self.current_index
         }
@@ -176,13 +281,15 @@ class Playlist:
         playlist = cls(data['name'])
         playlist.play_mode = PlayMode(data.get('play_mode', 'loop'))
         
-        for item_data in data.get('items', []):
-            playlist.add_item(
+        playlist.add_items([
+            PlaylistItem(
                 filename=item_data['filename'],
                 duration=item_data.get('duration'),
-                transition=TransitionType(item_data.get('transition', 'none')),
+                transition=_transition_from_value(item_data.get('transition', 'none')),
                 transition_duration=item_data.get('transition_duration', 0.5)
             )
+            for item_data in data.get('items', [])
+        ])
             
         return playlist
 
@@ -196,6 +303,18 @@ class PlaylistManager:
         self.current_playlist: Optional[str] = None
         self.current_animation = None
         
+        # Decode the upcoming item in the background while the current one
+        # plays, so advancing does not stall on file I/O and decoding
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1,
+                                                     thread_name_prefix='playlist-prefetch')
+        self._next_future: Optional[Future] = None
+        self._next_filename: Optional[str] = None
+        
+        # Tiny LRU of recently decoded items (random mode revisits often)
+        self._prefetched: 'OrderedDict[str, Any]' = OrderedDict()
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_size = 2
+        
     def create_playlist(self, name: str) -> Playlist:
         """Create a new playlist"""
         playlist = Playlist(name)
@@ -222,6 +341,35 @@ class PlaylistManager:
             playlist = self.playlists[name]
             playlist.start()
             self._load_current_item()
+            self._warm_cache(playlist)
+            
+    def _warm_cache(self, playlist: Playlist):
+        """Pull the playlist's files into the OS page cache in the background"""
+        # Snapshot now; the item list may change while the thread runs
+        filenames = list(dict.fromkeys(item.filename for item in playlist.items))
+        if len(filenames) <= 1:
+            return
+        thread = threading.Thread(target=self._warm_files, args=(playlist, filenames[1:]),
+                                  name='playlist-warm', daemon=True)
+        thread.start()
+        
+    def _warm_files(self, playlist: Playlist, filenames: List[str]):
+        """Background worker: read ahead each file, paced to spare the disk queue"""
+        for filename in filenames:
+            # Stop once another playlist has been selected
+            if self.playlists.get(self.current_playlist) is not playlist:
+                return
+            try:
+                with open(filename, 'rb') as f:
+                    if hasattr(os, 'posix_fadvise'):
+                        # Kernel readahead; no copy into userspace
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                    else:
+                        while f.read(1 << 20):
+                            pass
+            except OSError:
+                continue
+            time.sleep(0.1)
             
     def _load_current_item(self):
         """Load the current playlist item"""
@@ -232,7 +380,69 @@ class PlaylistManager:
         item = playlist.get_current_item()
         
         if item and os.path.exists(item.filename):
-            self.current_animation = self.frame_processor.load_media(item.filename)
+            self.current_animation = self._take_prefetched(item.filename)
+            if self.current_animation is None:
+                self.current_animation = self.frame_processor.load_media(item.filename)
+            self._prefetch_next()
+            
+    def _peek_next_filename(self) -> Optional[str]:
+        """Filename of the item the playlist will advance to next"""
+        if not self.current_playlist:
+            return None
+            
+        playlist = self.playlists[self.current_playlist]
+        index = playlist.peek_next_index()
+        if index is None or index == playlist.current_index:
+            return None
+        return playlist.items[index].filename
+        
+    def _prefetch_next(self):
+        """Start decoding the next item in the background"""
+        filename = self._peek_next_filename()
+        if filename is None or filename == self._next_filename:
+            return
+        with self._prefetch_lock:
+            if filename in self._prefetched:
+                return
+        if not os.path.exists(filename):
+            return
+            
+        self._next_filename = filename
+        self._next_future = self._prefetch_executor.submit(self._prefetch, filename)
+        
+    def _prefetch(self, filename: str):
+        """Background worker: decode one item and keep it in the LRU"""
+        animation = self.frame_processor.load_media(filename)
+        if animation is not None:
+            with self._prefetch_lock:
+                self._prefetched[filename] = animation
+                self._prefetched.move_to_end(filename)
+                while len(self._prefetched) > self._prefetch_size:
+                    self._prefetched.popitem(last=False)
+        return animation
+        
+    def _take_prefetched(self, filename: str):
+        """Return a prefetched animation for filename, waiting if in flight"""
+        if filename == self._next_filename and self._next_future is not None:
+            future = self._next_future
+            self._next_future = None
+            self._next_filename = None
+            try:
+                # Finishing an in-flight decode beats starting a second one
+                return future.result()
+            except Exception as e:
+                logger.error(f"Prefetch of {filename} failed: {e}")
+                return None
+                
+        with self._prefetch_lock:
+            animation = self._prefetched.get(filename)
+            if animation is not None:
+                self._prefetched.move_to_end(filename)
+            return animation
+            
+    def shutdown(self):
+        """Stop the background prefetch worker"""
+        self._prefetch_executor.shutdown(wait=False)
             
     def update(self, delta_time: float):
         """Update playlist state"""
@@ -254,26 +464,42 @@ class PlaylistManager:
         
     def save_playlists(self, filepath: str):
         """Save all playlists to file"""
-        import json
         data = {
             name: playlist.to_dict()
             for name, playlist in self.playlists.items()
         }
         
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        if HAS_ORJSON:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2).encode('utf-8')
+            
+        # Write a uniquely named temp file next to the target, flush it to disk
+        # and rename it over the target, so a crash mid-write never leaves a
+        # truncated playlist file behind and concurrent saves don't collide
+        tmp = tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(filepath)),
+                                          prefix='.playlists-', suffix='.tmp', delete=False)
+        try:
+            with tmp:
+                tmp.write(payload)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp.name, filepath)
+        finally:
+            # Only left behind if writing or renaming failed
+            if os.path.exists(tmp.name):
+                os.unlink(tmp.name)
             
         logger.info(f"Saved {len(self.playlists)} playlists to {filepath}")
         
     def load_playlists(self, filepath: str):
         """Load playlists from file"""
-        import json
-        
         if not os.path.exists(filepath):
             return
             
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
             
         self.playlists.clear()
         for name, playlist_data in data.items():
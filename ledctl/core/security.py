@@ -7,50 +7,69 @@ import hashlib
 import hmac
 import time
 import logging
-from functools import wraps
-from typing import Optional, Dict, Any, List, Callable
+import secrets
+from functools import wraps, lru_cache
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from datetime import datetime, timedelta
+from urllib.parse import urlparse, urljoin
 
 from flask import request, jsonify, current_app
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_cors import CORS
 from marshmallow import Schema, fields, validate, ValidationError
-from redis import Redis
+
+try:
+    from redis import Redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
 
 logger = logging.getLogger(__name__)
 
+# Filename character rules, compiled once: alphanumeric, dash, underscore, dot
+_UNSAFE_CHARS_SUB = re.compile(r'[^a-zA-Z0-9_\-.]').sub
+_SAFE_FILENAME_MATCH = re.compile(r'[a-zA-Z0-9_\-.]+').fullmatch
 
-# Rate limiter storage backend
-def get_redis_connection():
-    """Get Redis connection for rate limiting, fallback to memory if not available."""
-    try:
-        redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379')
-        r = Redis.from_url(redis_url)
-        r.ping()
-        logger.info("Using Redis for rate limiting")
-        return r
-    except Exception as e:
-        logger.warning(f"Redis not available, using memory storage: {e}")
-        return None
+# Content-Security-Policy sent in production
+_CSP = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.socket.io; "
+    "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+    "font-src 'self' https://cdn.jsdelivr.net; "
+    "img-src 'self' data: blob:; "
+    "connect-src 'self' ws: wss:;"
+)
 
+# Security headers set on every response, prebuilt for one update() call
+_STATIC_SEC_HEADERS = (
+    ('X-Content-Type-Options', 'nosniff'),
+    ('X-Frame-Options', 'DENY'),
+    ('X-XSS-Protection', '1; mode=block'),
+    ('Referrer-Policy', 'strict-origin-when-cross-origin'),
+)
+_PROD_SEC_HEADERS = _STATIC_SEC_HEADERS + (('Content-Security-Policy', _CSP),)
+
+
+def _read_auth_flag() -> bool:
+    """Read API_AUTH_ENABLED from the environment"""
+    return os.getenv('API_AUTH_ENABLED', 'False').strip().lower() == 'true'
+
+
+# API key auth switch, resolved on the first protected request rather than on
+# every one. Deferring it means main() has loaded any --env file by then.
+_api_auth_enabled: Optional[bool] = None
 
-# Initialize rate limiter
-redis_conn = get_redis_connection()
-if redis_conn:
-    limiter = Limiter(
-        key_func=get_remote_address,
-        default_limits=["200 per hour", "50 per minute"],
-        storage_uri=f"redis://localhost:6379",
-        swallow_errors=True  # Don't fail if rate limiting backend is down
-    )
-else:
-    limiter = Limiter(
-        key_func=get_remote_address,
-        default_limits=["200 per hour", "50 per minute"],
-        storage_uri="memory://",
-        swallow_errors=True  # Don't fail if rate limiting backend is down
-    )
+
+# Initialize rate limiter. The storage backend is picked in init_rate_limiter()
+# once configuration is loaded, so importing this module never touches Redis.
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=["200 per hour", "50 per minute"],
+    swallow_errors=True,  # Don't fail if rate limiting backend is down
+    # Keep enforcing limits in memory while Redis is unreachable
+    in_memory_fallback_enabled=True
+)
 
 
 # Input validation schemas
@@ -63,8 +82,7 @@ class FileUploadSchema(Schema):
     def validate_filename(filename: str) -> bool:
         """Validate filename for security."""
         # Allow only alphanumeric, dash, underscore, and dot
-        pattern = r'^[a-zA-Z0-9_\-\.]+$'
-        return bool(re.match(pattern, filename))
+        return _SAFE_FILENAME_MATCH(filename) is not None
 
 
 class DeviceConfigSchema(Schema):
@@ -125,6 +143,8 @@ class APIKeyManager:
     
     def __init__(self):
         self.keys = {}
+        # (binary digest, hex digest) pairs for constant-time comparison
+        self._key_digests: List[Tuple[bytes, str]] = []
         self._load_keys()
     
     def _load_keys(self):
@@ -140,23 +160,31 @@ class APIKeyManager:
                     'last_used': None,
                     'usage_count': 0
                 }
+        self._key_digests = [(bytes.fromhex(h), h) for h in self.keys]
     
     def validate_key(self, key: str) -> bool:
         """Validate an API key."""
         if not key:
             return False
             
-        key_hash = hashlib.sha256(key.encode()).hexdigest()
-        if key_hash in self.keys:
+        # Binary digest (no hex formatting), compared in constant time
+        # against every stored key so timing reveals nothing about matches
+        digest = hashlib.sha256(key.encode()).digest()
+        matched = None
+        for key_digest, key_hash in self._key_digests:
+            if hmac.compare_digest(digest, key_digest):
+                matched = key_hash
+                
+        if matched is not None:
             # Update usage stats
-            self.keys[key_hash]['last_used'] = datetime.now()
-            self.keys[key_hash]['usage_count'] += 1
+            stats = self.keys[matched]
+            stats['last_used'] = datetime.now()
+            stats['usage_count'] += 1
             return True
         return False
     
     def generate_key(self) -> str:
         """Generate a new API key."""
-        import secrets
         return secrets.token_urlsafe(32)
 
 
@@ -167,17 +195,21 @@ api_key_manager = APIKeyManager()
 # Decorators
 def validate_input(schema_class: Schema):
     """Decorator to validate request input."""
+    # Build the schema once per decorated view; load() keeps no per-call
+    # state on the instance, so requests can share it
+    schema = schema_class()
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Get data from request
+            # Get data from request. Query args are a MultiDict (a Mapping
+            # whose get() returns the first value), so load() reads it as is.
             if request.method == 'GET':
-                data = request.args.to_dict()
+                data = request.args
             else:
                 data = request.get_json() or {}
             
             # Validate
-            schema = schema_class()
             try:
                 validated_data = schema.load(data)
                 request.validated_data = validated_data
@@ -198,7 +230,10 @@ def require_api_key(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         # Check if API key authentication is enabled
-        if not os.getenv('API_AUTH_ENABLED', 'False').lower() == 'true':
+        global _api_auth_enabled
+        if _api_auth_enabled is None:
+            _api_auth_enabled = _read_auth_flag()
+        if not _api_auth_enabled:
             return f(*args, **kwargs)
         
         # Get API key from header or query parameter
@@ -224,22 +259,76 @@ def sanitize_path(path: str) -> Optional[str]:
     path = os.path.basename(path)
     
     # Remove any non-alphanumeric characters except dash, underscore, and dot
-    path = re.sub(r'[^a-zA-Z0-9_\-\.]', '', path)
+    path = _UNSAFE_CHARS_SUB('', path)
     
     return path if path else None
 
 
+@lru_cache(maxsize=16)
+def _extension_set(extensions: Tuple[str, ...]) -> frozenset:
+    """Lower-cased set of allowed extensions, built once per distinct list."""
+    return frozenset(ext.lower() for ext in extensions)
+
+
 def validate_file_type(filename: str, allowed_extensions: List[str]) -> bool:
     """Validate file type against allowed extensions."""
     if not filename:
         return False
     
-    ext = os.path.splitext(filename)[1].lower()[1:]  # Remove dot
+    # Like os.path.splitext, leading dots (".gif") don't start an extension
+    dot = filename.rfind('.')
+    if dot < 0 or not filename[:dot].lstrip('.'):
+        return False
+    ext = filename[dot + 1:].lower()
+    
+    if not isinstance(allowed_extensions, frozenset):
+        allowed_extensions = _extension_set(tuple(allowed_extensions))
     return ext in allowed_extensions
 
 
+def _rate_limit_storage_uri() -> str:
+    """Pick the rate limit storage: REDIS_URL, else local Redis if it answers, else memory"""
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url:
+        return redis_url
+    if HAS_REDIS:
+        try:
+            Redis.from_url('redis://localhost:6379', socket_connect_timeout=0.5).ping()
+            return 'redis://localhost:6379'
+        except Exception as e:
+            logger.warning(f"Redis not available, using memory storage: {e}")
+    return 'memory://'
+
+
+def init_rate_limiter(app):
+    """
+    Attach the rate limiter to the app
+    
+    Call once, after configuration (including any --env file) is loaded, so
+    REDIS_URL is seen. An explicit RATELIMIT_STORAGE_URI in app.config wins.
+    
+    Args:
+        app: Flask application
+    """
+    if 'RATELIMIT_STORAGE_URI' not in app.config:
+        app.config['RATELIMIT_STORAGE_URI'] = _rate_limit_storage_uri()
+    limiter.init_app(app)
+    logger.info(f"Rate limiting storage: {app.config['RATELIMIT_STORAGE_URI'].split('://', 1)[0]}")
+
+
 def setup_security(app, socketio):
-    """Setup security features for the Flask app."""
+    """Setup security features for the Flask app. Rate limiting is attached separately by init_rate_limiter()."""
+    # Re-read the auth switch on the next request
+    global _api_auth_enabled
+    _api_auth_enabled = None
+    
+    # Environment is fixed for the app's lifetime; resolve it once
+    is_prod = app.config.get('ENV') == 'production'
+    is_dev = app.config.get('ENV') == 'development'
+    
+    # Add CSP header for production
+    security_headers = _PROD_SEC_HEADERS if is_prod else _STATIC_SEC_HEADERS
+    
     # Initialize CORS
     CORS(app, resources={
         r"/api/*": {
@@ -250,39 +339,24 @@ def setup_security(app, socketio):
         }
     })
     
-    # Initialize rate limiter
-    limiter.init_app(app)
-    
     # Add security headers
     @app.after_request
     def add_security_headers(response):
-        response.headers['X-Content-Type-Options'] = 'nosniff'
-        response.headers['X-Frame-Options'] = 'DENY'
-        response.headers['X-XSS-Protection'] = '1; mode=block'
-        response.headers['Referrer-Policy'] = 'strict-origin-when-cross-origin'
-        
-        # Add CSP header for production
-        if app.config.get('ENV') == 'production':
-            csp = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://cdn.socket.io; "
-                "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
-                "font-src 'self' https://cdn.jsdelivr.net; "
-                "img-src 'self' data: blob:; "
-                "connect-src 'self' ws: wss:;"
-            )
-            response.headers['Content-Security-Policy'] = csp
-        
+        # Overwrite rather than append so a view's own value isn't duplicated
+        response.headers.update(security_headers)
         return response
     
     # Request logging
     @app.before_request
     def log_request():
         """Log incoming requests for monitoring."""
-        logger.info(f"{request.method} {request.path} from {request.remote_addr}")
+        # Check the level first so filtered-out records skip the formatting
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"{request.method} {request.path} from {request.remote_addr}")
         
-        # Log request body for debugging (be careful with sensitive data)
-        if app.config.get('ENV') == 'development' and request.is_json:
+        # Log request body for debugging (be careful with sensitive data).
+        # get_json() caches the parse, so validate_input reuses it.
+        if is_dev and logger.isEnabledFor(logging.DEBUG) and request.is_json:
             logger.debug(f"Request body: {request.get_json()}")
     
     # Rate limit error handler
@@ -301,19 +375,15 @@ def setup_security(app, socketio):
 # Utility functions for use in routes
 def get_client_ip() -> str:
     """Get the real client IP address."""
-    # Check for proxy headers
-    if request.headers.get('X-Forwarded-For'):
-        return request.headers.get('X-Forwarded-For').split(',')[0].strip()
-    elif request.headers.get('X-Real-IP'):
-        return request.headers.get('X-Real-IP')
-    else:
-        return request.remote_addr
+    # Check for proxy headers; the first X-Forwarded-For entry is the client
+    forwarded_for = request.headers.get('X-Forwarded-For')
+    if forwarded_for:
+        return forwarded_for.split(',', 1)[0].strip()
+    return request.headers.get('X-Real-IP') or request.remote_addr
 
 
 def is_safe_url(target):
     """Check if a URL is safe for redirection."""
-    from urllib.parse import urlparse, urljoin
-    
     ref_url = urlparse(request.host_url)
     test_url = urlparse(urljoin(request.host_url, target))
     
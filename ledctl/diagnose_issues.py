@@ -6,6 +6,7 @@ Diagnose configuration and runtime issues in the LB3C codebase
 import os
 import sys
 import traceback
+from importlib.util import find_spec
 
 try:
     import yaml
@@ -23,7 +24,7 @@ def check_env_file():
     env_path = os.path.join(os.path.dirname(__file__), '.env')
     env_example_path = os.path.join(os.path.dirname(__file__), '.env.example')
     
-    if not os.path.exists(env_path):
+    if not os.access(env_path, os.F_OK):
         print(f"❌ ERROR: .env file not found at {env_path}")
         print(f"   Copy {env_example_path} to {env_path} and configure it")
         return False
@@ -51,19 +52,26 @@ def check_yaml_config():
     default_config_path = 'config/device.default.yml'
     
     # Check which config exists
-    if os.path.exists(config_path):
+    if os.access(config_path, os.F_OK):
         active_config = config_path
-    elif os.path.exists(default_config_path):
+    elif os.access(default_config_path, os.F_OK):
         active_config = default_config_path
         print(f"ℹ Using default config: {default_config_path}")
     else:
         print(f"❌ ERROR: No configuration file found")
         return False
         
+    try:
+        # Same (libyaml when available) loader the app uses
+        from core.config import SafeLoader
+    except ImportError:
+        # core.config needs python-dotenv; check_imports reports it missing
+        SafeLoader = yaml.SafeLoader
+        
     # Load and validate YAML
     try:
         with open(active_config, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
         print(f"✓ YAML config loaded successfully from {active_config}")
     except Exception as e:
         print(f"❌ ERROR loading YAML: {e}")
@@ -71,12 +79,15 @@ def check_yaml_config():
         
     # Check required sections
     required_sections = ['device', 'render', 'server']
+    if not isinstance(config, dict):
+        print("❌ ERROR: Config file is empty or not a mapping")
+        return False
+    missing = [section for section in required_sections if section not in config]
+    if missing:
+        print(f"❌ ERROR: Missing required section(s) {', '.join(repr(m) for m in missing)} in config")
+        return False
     for section in required_sections:
-        if section not in config:
-            print(f"❌ ERROR: Missing required section '{section}' in config")
-            return False
-        else:
-            print(f"✓ Config section '{section}' exists")
+        print(f"✓ Config section '{section}' exists")
             
     # Check device type configuration
     device_type = config.get('device')
@@ -108,6 +119,16 @@ def check_config_module():
     """Check the Config class implementation"""
     print("\n=== Checking Config Module ===")
     
+    # Cheap presence check first so a missing module doesn't cost an
+    # attempted import of its dependency tree
+    try:
+        spec = find_spec('core.config')
+    except ImportError:
+        spec = None
+    if spec is None:
+        print("❌ ERROR: core.config module not found on the Python path")
+        return False
+        
     try:
         from core.config import Config, ConfigurationError
         print("✓ Config module imports successfully")
@@ -172,12 +193,13 @@ def check_imports():
         ('redis', 'redis')
     ]
     
+    # find_spec only asks the import finders, so no package's import-time
+    # code runs; it checks installation, not whether the import succeeds
     all_good = True
     for module, package in modules_to_check:
-        try:
-            __import__(module)
+        if find_spec(module) is not None:
             print(f"✓ {module} ({package})")
-        except ImportError:
+        else:
             print(f"❌ Missing: {module} - install with: pip install {package}")
             all_good = False
             
@@ -197,10 +219,23 @@ def check_project_structure():
         ('api/', 'API directory'),
     ]
     
+    # List each parent directory once instead of stat()ing every path
+    base = os.path.dirname(os.path.abspath(__file__))
+    listings = {}
+    
+    def entries(parent):
+        if parent not in listings:
+            try:
+                with os.scandir(os.path.join(base, parent)) as it:
+                    listings[parent] = {entry.name for entry in it}
+            except OSError:
+                listings[parent] = set()
+        return listings[parent]
+    
     all_good = True
     for path, description in required_paths:
-        full_path = os.path.join(os.path.dirname(__file__), path)
-        if os.path.exists(full_path):
+        parent, name = os.path.split(path.rstrip('/'))
+        if name in entries(parent):
             print(f"✓ {description}: {path}")
         else:
             print(f"❌ Missing: {description} at {path}")
@@ -10,9 +10,13 @@ def generate_api_key():
     """Generate a cryptographically secure API key."""
     return secrets.token_urlsafe(32)
 
+# SHA256 to match the digests APIKeyManager in core/security.py computes
+_sha256 = hashlib.sha256
+
 def hash_api_key(key):
     """Generate SHA256 hash of API key for storage."""
-    return hashlib.sha256(key.encode()).hexdigest()
+    # token_urlsafe keys are plain ASCII
+    return _sha256(key.encode('ascii')).hexdigest()
 
 if __name__ == "__main__":
     # Generate one or more keys
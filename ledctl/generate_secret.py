@@ -6,10 +6,24 @@ Generate a secure secret key for Flask
 import secrets
 import string
 
-def generate_secret_key(length=32):
+SECRET_ALPHABET = string.ascii_letters + string.digits + string.punctuation
+
+def generate_secret_key(length=32, alphabet=SECRET_ALPHABET):
     """Generate a secure random secret key"""
-    alphabet = string.ascii_letters + string.digits + string.punctuation
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    n = len(alphabet)
+    if not 0 < n <= 256:
+        raise ValueError("alphabet must have between 1 and 256 characters")
+    # Draw random bytes in batches and keep only those below the largest
+    # multiple of n, so byte % n stays uniform (rejection sampling)
+    limit = 256 - 256 % n
+    chars = []
+    while len(chars) < length:
+        chars.extend([alphabet[b % n] for b in secrets.token_bytes(2 * length) if b < limit])
+    return ''.join(chars[:length])
+
+def generate_hex_key(nbytes=32):
+    """Generate a secure random hex key (2 * nbytes characters)"""
+    return secrets.token_hex(nbytes)
 
 if __name__ == '__main__':
     secret_key = generate_secret_key()
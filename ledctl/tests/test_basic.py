@@ -45,6 +45,16 @@ class MockDevice(OutputDevice):
         logger.info(f"Mock frame drawn: {width}x{height}, {len(rgb_data)} pixels")
 
 
+class RecordingSocket:
+    """UDP socket stand-in that records sent packets"""
+    
+    def __init__(self):
+        self.packets = []
+        
+    def sendto(self, data, address):
+        self.packets.append(bytes(data))
+
+
 def test_device_manager():
     """Test device registration and creation"""
     print("\n=== Testing Device Manager ===")
@@ -109,6 +119,196 @@ def test_frame_processor():
     os.remove(test_path)
 
 
+def test_animation_timing():
+    """Test frame lookup by time and constant-duration playback"""
+    print("\n=== Testing Animation Timing ===")
+    
+    from core.frames import MediaAnimation
+    
+    def make_frames(count):
+        return np.arange(count, dtype=np.uint8).repeat(3).reshape(count, 1, 1, 3)
+        
+    # Frame boundaries belong to the next frame; looping wraps the time
+    anim = MediaAnimation(make_frames(3), [0.25, 0.5, 0.25], 'test')
+    for t, expected in [(0.0, 0), (0.24, 0), (0.25, 1), (0.74, 1), (0.75, 2), (1.1, 0)]:
+        assert anim.get_frame_at_time(t)[1] == expected, t
+    anim.loop = False
+    assert anim.get_frame_at_time(10.0)[1] == 2
+    
+    # The constant-duration fast path matches stepping one frame at a time
+    deltas = [0.0625, 0.375, 1.0, 0.125, 2.5, 0.0625]
+    for loop in (True, False):
+        fast = MediaAnimation(make_frames(7), [0.125] * 7, 'fast')
+        slow = MediaAnimation(make_frames(7), [0.125] * 7, 'slow')
+        slow._const_duration = None
+        fast.loop = slow.loop = loop
+        for delta in deltas:
+            assert fast.get_next_frame(delta)[0, 0, 0] == slow.get_next_frame(delta)[0, 0, 0]
+            assert fast.current_frame == slow.current_frame
+    print("Frame timing matches the reference stepping")
+
+
+def test_wled_brightness_scaling():
+    """Test WLED payload brightness scaling"""
+    print("\n=== Testing WLED Brightness Scaling ===")
+    
+    from core.drivers.wled_udp import _swar_scale
+    
+    payload = bytes(range(256)) * 3
+    for brightness in (0, 1, 128, 200, 255):
+        expected = bytes((value * brightness) // 255 for value in payload)
+        assert _swar_scale(payload, brightness) == expected
+        
+    # Odd lengths leave a half-filled lane at the end
+    assert _swar_scale(b'\xff\x80\x01', 128) == bytes([128, 64, 0])
+    print("SWAR scaling matches per-byte reference")
+
+
+def test_wled_dnrgb_diff():
+    """Test WLED DNRGB sends only changed spans"""
+    print("\n=== Testing WLED DNRGB Diff ===")
+    
+    from core.drivers.wled_udp import WLEDDevice
+    
+    device = WLEDDevice({'wled': {'protocol': 'DNRGB', 'width': 40, 'height': 25}})
+    device.socket = RecordingSocket()
+    device.is_open = True
+    device.packet_interval = 0
+    
+    # First frame is sent in full, split into 489-LED packets
+    frame = [(10, 20, 30)] * 1000
+    device.draw_rgb_frame(40, 25, frame)
+    starts = [int.from_bytes(p[1:3], 'big') for p in device.socket.packets]
+    assert starts == [0, 489, 978]
+    
+    # Unchanged frame sends nothing, a single changed LED sends one packet
+    device.socket.packets.clear()
+    device.draw_rgb_frame(40, 25, frame)
+    assert device.socket.packets == []
+    
+    frame = list(frame)
+    frame[700] = (255, 0, 0)
+    device.draw_rgb_frame(40, 25, frame)
+    assert device.socket.packets == [bytes([3, 700 >> 8, 700 & 0xFF, 255, 0, 0])]
+    print("DNRGB diff sends only changed spans")
+
+
+def test_wled_warls_packets():
+    """Test WLED WARLS header layout and packet splitting"""
+    print("\n=== Testing WLED WARLS Packets ===")
+    
+    from core.drivers.wled_udp import WLEDDevice
+    
+    device = WLEDDevice({'wled': {'protocol': 'WARLS', 'width': 40, 'height': 25}})
+    device.socket = RecordingSocket()
+    device.is_open = True
+    device.packet_interval = 0
+    
+    frame = [(i % 256, (i * 7) % 256, 255 - i % 256) for i in range(1000)]
+    device.draw_rgb_frame(40, 25, frame)
+    packets = device.socket.packets
+    assert len(packets) == 3
+    
+    # Nine-byte header: protocol, timeout, LED count, channel, sequence, start
+    for seq, (start, count) in enumerate([(0, 490), (490, 490), (980, 20)]):
+        packet = packets[seq]
+        header = bytes([1, 0, 25, count >> 8, count & 0xFF, 0, seq, start >> 8, start & 0xFF])
+        assert packet[:9] == header
+        payload = bytes(value for pixel in frame[start:start + count] for value in pixel)
+        assert packet[9:] == payload
+    print("WARLS packets carry a 9-byte header and 490-LED payloads")
+
+
+def test_mapper_layouts():
+    """Test serpentine and spiral LED orders"""
+    print("\n=== Testing Mapper Layouts ===")
+    
+    from core.mapper import PixelMapper, MappingType
+    
+    # Serpentine reverses every odd row
+    mapper = PixelMapper(4, 3, MappingType.SERPENTINE)
+    assert mapper.forward_map.tolist() == [0, 1, 2, 3, 7, 6, 5, 4, 8, 9, 10, 11]
+    frame = np.arange(12 * 3, dtype=np.uint8).reshape(12, 3)
+    assert np.array_equal(mapper.map_frame(frame), frame[[0, 1, 2, 3, 7, 6, 5, 4, 8, 9, 10, 11]])
+    assert mapper.reverse_map[4].tolist() == [3, 1]
+    
+    # Spiral starts at the center and turns right, down, left, up
+    mapper = PixelMapper(3, 3, MappingType.SPIRAL)
+    assert mapper.forward_map.tolist() == [4, 5, 8, 7, 6, 3, 0, 1, 2]
+    
+    def walk_spiral(width, height):
+        """Step-by-step reference walk with run lengths 1, 1, 2, 2, ..."""
+        x, y = width // 2, height // 2
+        order, seen = [], set()
+        run, direction = 1, 0
+        moves = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+        while len(order) < width * height:
+            for _ in range(2):
+                for _ in range(run):
+                    if 0 <= x < width and 0 <= y < height and (x, y) not in seen:
+                        seen.add((x, y))
+                        order.append(y * width + x)
+                    x += moves[direction][0]
+                    y += moves[direction][1]
+                direction = (direction + 1) % 4
+            run += 1
+        return order[:width * height]
+        
+    for width, height in [(1, 1), (4, 4), (5, 3), (2, 6), (8, 5)]:
+        mapper = PixelMapper(width, height, MappingType.SPIRAL)
+        assert mapper.forward_map.tolist() == walk_spiral(width, height), (width, height)
+    print("Serpentine and spiral orders match")
+
+
+def test_playlist_random_bag():
+    """Test RANDOM mode plays every item once per cycle without repeats"""
+    print("\n=== Testing Playlist Random Bag ===")
+    
+    from core.playlists import Playlist, PlayMode
+    
+    playlist = Playlist('shuffle')
+    for i in range(5):
+        playlist.add_item(f'{i}.gif')
+    playlist.play_mode = PlayMode.RANDOM
+    playlist.start()
+    
+    played = [playlist.current_index]
+    for _ in range(5 * 40):
+        expected = playlist.peek_next_index()
+        playlist.next_item()
+        assert playlist.current_index == expected
+        played.append(playlist.current_index)
+        
+    # Each cycle of five advances is a permutation, even across bag refills
+    for cycle in range(40):
+        assert sorted(played[1 + cycle * 5:1 + (cycle + 1) * 5]) == list(range(5))
+    assert all(a != b for a, b in zip(played, played[1:]))
+    print("Random mode shuffles without back-to-back repeats")
+
+
+def test_playlist_item_updates():
+    """Test playlist items are immutable and updates reach to_dict()"""
+    print("\n=== Testing Playlist Item Updates ===")
+    
+    from dataclasses import FrozenInstanceError
+    from core.playlists import Playlist
+    
+    playlist = Playlist('test')
+    playlist.add_item('a.gif', duration=2)
+    assert playlist.to_dict()['items'][0]['duration'] == 2
+    
+    # Items can't be edited behind the cached to_dict() items
+    try:
+        playlist.items[0].duration = 5
+        assert False, "PlaylistItem should be frozen"
+    except FrozenInstanceError:
+        pass
+        
+    playlist.update_item(0, duration=5)
+    assert playlist.to_dict()['items'][0]['duration'] == 5
+    print("Item updates invalidate the cached dict")
+
+
 def test_color_patterns():
     """Test various color patterns on mock device"""
     print("\n=== Testing Color Patterns ===")
@@ -147,6 +347,43 @@ def test_color_patterns():
     device.close()
 
 
+def test_packed_device_switch():
+    """Test that packed frames follow the device they were packed for"""
+    print("\n=== Testing Packed Frames Across Device Switch ===")
+    
+    from core.frames import MediaAnimation
+    
+    class PackingDevice(MockDevice):
+        def __init__(self, config, offset):
+            super().__init__(config)
+            self.offset = offset
+            
+        def pack_frames(self, frames):
+            return frames.reshape(len(frames), -1).astype(np.uint32) + self.offset
+            
+        def draw_packed(self, packed, color_lut=None):
+            self.last_frame = packed
+            
+    frames = np.arange(12, dtype=np.uint8).reshape(2, 1, 2, 3)
+    first = PackingDevice({}, 0)
+    anim = MediaAnimation(frames, [0.1, 0.1], 'test')
+    anim.pack_for(first)
+    anim.get_next_frame(0.1)
+    assert np.array_equal(anim.get_packed_frame(first), np.arange(6, 12))
+    
+    # A device without draw_packed, or one the frames weren't packed for,
+    # gets no packed buffer until the animation is re-packed
+    plain = MockDevice({})
+    second = PackingDevice({}, 100)
+    assert anim.get_packed_frame(plain) is None
+    assert anim.get_packed_frame(second) is None
+    anim.pack_for(plain)
+    assert anim.packed_frames is None and anim.get_packed_frame(first) is None
+    anim.pack_for(second)
+    assert np.array_equal(anim.get_packed_frame(second), np.arange(106, 112))
+    print("Packed frames are only used on the device that packed them")
+
+
 def main():
     """Run all tests"""
     print("LED Animation Control System - Basic Tests")
@@ -157,6 +394,14 @@ def main():
         device = test_device_manager()
         test_gamma_correction()
         test_frame_processor()
+        test_animation_timing()
+        test_packed_device_switch()
+        test_wled_brightness_scaling()
+        test_wled_dnrgb_diff()
+        test_wled_warls_packets()
+        test_mapper_layouts()
+        test_playlist_random_bag()
+        test_playlist_item_updates()
         test_color_patterns()
         
         print("\n✅ All basic tests passed!")